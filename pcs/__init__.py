@@ -5,16 +5,29 @@ Polyglot Code Sampler - Transform Python comprehensions across 5 ecosystems
 from .__version__ import __version__
 from .cli import main
 from .core import IRComp, IRGenerator, IRRange, IRReduce, PyToIR, TypeInfo
-from .renderer_api import (
-    render,
-    render_csharp,
-    render_go,
-    render_julia,
-    render_rust,
-    render_sql,
-    render_ts,
+
+# The renderer API pulls in every backend; load it on first attribute access
+_RENDERER_API_NAMES = frozenset(
+    {
+        "render",
+        "render_csharp",
+        "render_go",
+        "render_julia",
+        "render_rust",
+        "render_sql",
+        "render_ts",
+    }
 )
 
+
+def __getattr__(name):
+    if name in _RENDERER_API_NAMES:
+        from . import renderer_api
+
+        return getattr(renderer_api, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     "__version__",
     "PyToIR",
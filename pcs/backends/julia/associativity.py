@@ -2,6 +2,8 @@
 Exhaustive associativity gate - central mapping for operations
 """
 
+from functools import lru_cache
+
 # Central mapping for operations → associativity & identity
 ASSOC_TABLE = {
     "+": {"types": {"Int", "Float64"}, "identity": "0"},
@@ -16,11 +18,27 @@ ASSOC_TABLE = {
 }
 
 
+def _resolve_identity(ident: str, elem_type: str) -> str:
+    """Normalize Inf/-Inf identities for the element type"""
+    if ident == "Inf":
+        return "Inf32" if elem_type == "Int" else "Inf"
+    elif ident == "-Inf":
+        return "-Inf32" if elem_type == "Int" else "-Inf"
+    return ident
+
+
+# Flat (op, elem_type) → identity view of ASSOC_TABLE, resolved once at import.
+# Only associative pairs are present, so membership doubles as the gate.
+_ASSOC_CACHE = {
+    (op, elem_type): _resolve_identity(entry["identity"], elem_type)
+    for op, entry in ASSOC_TABLE.items()
+    for elem_type in entry["types"]
+}
+
+
 def is_associative(op: str, elem_type: str) -> bool:
     """Check if operation is associative for given type"""
-    if op not in ASSOC_TABLE:
-        return False
-    return elem_type in ASSOC_TABLE[op]["types"]
+    return (op, elem_type) in _ASSOC_CACHE
 
 
 def get_associative_ops() -> set:
@@ -37,20 +55,17 @@ def get_supported_types(op: str) -> set:
 
 def assoc_identity(op: str, elem_type: str) -> str:
     """Get identity element for associative operation"""
+    ident = _ASSOC_CACHE.get((op, elem_type))
+    if ident is not None:
+        return ident
+
+    # Unsupported type for a known op still reports the table identity
     if op not in ASSOC_TABLE:
         return "0"
-
-    ident = ASSOC_TABLE[op]["identity"]
-
-    # Handle special cases for Inf/-Inf
-    if ident == "Inf":
-        return "Inf32" if elem_type == "Int" else "Inf"
-    elif ident == "-Inf":
-        return "-Inf32" if elem_type == "Int" else "-Inf"
-
-    return ident
+    return _resolve_identity(ASSOC_TABLE[op]["identity"], elem_type)
 
 
+@lru_cache(maxsize=64)
 def get_parallel_note(op: str, elem_type: str) -> str:
     """Generate NOTE comment for parallelization"""
     if not is_associative(op, elem_type):
@@ -65,8 +80,8 @@ def get_associativity_explanation(op: str, elem_type: str) -> str:
     if op not in ASSOC_TABLE:
         return f"Operation '{op}' not in associativity table"
 
-    supported_types = get_supported_types(op)
-    if elem_type not in supported_types:
+    if (op, elem_type) not in _ASSOC_CACHE:
+        supported_types = get_supported_types(op)
         return f"Type '{elem_type}' not supported for '{op}' (supported: {supported_types})"
 
     return f"Operation '{op}' is associative for type '{elem_type}'"
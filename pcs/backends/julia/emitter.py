@@ -2,9 +2,17 @@
 Julia AST/strings builder with block context manager
 """
 
+import io
 import re
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Optional, TextIO
+
+# Identifier sanitizing tables, built once
+_JL_IDENT_START = re.compile(r"^[a-zA-Z_]")
+_HYPHEN_TRANS = str.maketrans({"-": "_"})
+
+# Indentation prefixes, indexed by depth
+_INDENTS = tuple("    " * i for i in range(32))
 
 
 @dataclass
@@ -13,10 +21,18 @@ class JL:
 
     code: list[str]
     indent: int = 0
+    out: Optional[TextIO] = None  # when set, lines stream here instead of `code`
 
     def w(self, s: str = ""):
         """Write a line with proper indentation"""
-        self.code.append("    " * self.indent + s)
+        indent = self.indent
+        prefix = _INDENTS[indent] if indent < len(_INDENTS) else "    " * indent
+        if self.out is not None:
+            self.out.write(prefix)
+            self.out.write(s)
+            self.out.write("\n")
+        else:
+            self.code.append(prefix + s)
 
     def block(self, header: str, footer: str = "end"):
         """Create a block context manager"""
@@ -25,7 +41,7 @@ class JL:
         return _Block(self, footer)
 
     def render(self) -> str:
-        """Render the complete Julia code"""
+        """Render the complete Julia code (empty when streaming to `out`)"""
         return "\n".join(self.code)
 
 
@@ -47,29 +63,41 @@ class _Block:
 def jl_var(name: str) -> str:
     """Sanitize Julia identifiers"""
     # Replace hyphens with underscores, ensure valid Julia identifier
-    sanitized = name.replace("-", "_")
+    sanitized = name.translate(_HYPHEN_TRANS)
     # Ensure it starts with a letter or underscore
-    if not re.match(r"^[a-zA-Z_]", sanitized):
-        sanitized = f"_{sanitized}"
-    return sanitized
+    if _JL_IDENT_START.match(sanitized):
+        return sanitized
+    return "_" + sanitized
 
 
 def literal(v: Any) -> str:
     """Convert Python literals to Julia literals"""
+    buf = io.StringIO()
+    _write_literal(buf, v)
+    return buf.getvalue()
+
+
+def _write_literal(buf: io.StringIO, v: Any):
+    """Write a Julia literal for `v` into `buf`"""
     if isinstance(v, bool):
-        return "true" if v else "false"
+        buf.write("true" if v else "false")
     elif isinstance(v, str):
-        return f'"{v}"'
+        buf.write('"')
+        buf.write(v)
+        buf.write('"')
     elif isinstance(v, float):
-        return repr(v)
+        buf.write(repr(v))
     elif isinstance(v, int):
-        return str(v)
+        buf.write(str(v))
     elif isinstance(v, (list, tuple)):
         # Handle simple lists/tuples
-        if isinstance(v, tuple):
-            return f"({', '.join(literal(x) for x in v)})"
-        else:
-            return f"[{', '.join(literal(x) for x in v)}]"
+        open_, close = ("(", ")") if isinstance(v, tuple) else ("[", "]")
+        buf.write(open_)
+        for i, x in enumerate(v):
+            if i:
+                buf.write(", ")
+            _write_literal(buf, x)
+        buf.write(close)
     else:
         raise NotImplementedError(f"Unsupported literal type: {type(v)}")
 
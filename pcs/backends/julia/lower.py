@@ -2,11 +2,31 @@
 IR → Julia lowering rules for loops and broadcast modes
 """
 
+import re
+from typing import Optional, TextIO
+
 from ...core import IRComp, IRGenerator, IRRange
+from ...lowering import TILE_SIZE, lower_plan
 from .emitter import JL, gensym, reset_gensym
 from .strategy import choose_strategy, get_elem_type, get_op_kind, size_hint
 from .types import get_collection_type, get_reduction_type
 
+# Conditional keywords as whole words, so names like `stiff` or `factor` don't match
+_CTRL_PAT = re.compile(r"\b(?:if|else|and|or)\b")
+
+# Reductions whose accumulate step LLVM can turn into a SIMD reduction
+_SIMD_REDUCTIONS = frozenset({"sum", "max", "min"})
+
+# Broadcast reductions: (Julia reducer, identity used for filtered-out lanes)
+BROADCAST_REDUCERS = {
+    "sum": ("sum", "0"),
+    "prod": ("prod", "1"),
+    "max": ("maximum", "typemin(Int)"),
+    "min": ("minimum", "typemax(Int)"),
+    "any": ("any", "false"),
+    "all": ("all", "true"),
+}
+
 
 def lower_program(
     ir: IRComp,
@@ -14,12 +34,17 @@ def lower_program(
     parallel: bool = False,
     explain: bool = True,
     unsafe: bool = False,
+    out: Optional[TextIO] = None,
 ) -> str:
-    """Lower IR to Julia code"""
+    """Lower IR to Julia code
+
+    If `out` is given, the program is streamed into it line by line and an
+    empty string is returned instead of the rendered source.
+    """
     # Reset gensym counter for deterministic output
     reset_gensym()
 
-    jl = JL(code=[])
+    jl = JL(code=[], out=out)
 
     # Generate stable module name to avoid collisions
     ir_text = str(ir)  # Simple string representation for hashing
@@ -77,7 +102,7 @@ def _lower_entrypoint(
     op_kind = get_op_kind(ir)
     elem_type = get_elem_type(ir)
 
-    selected_mode, parallel_flavor, explanation = choose_strategy(
+    selected_mode, parallel_flavor, explanation, accumulator = choose_strategy(
         ir,
         user_mode=mode,
         elem_count_hint=elem_count_hint,
@@ -96,7 +121,12 @@ def _lower_entrypoint(
         _add_diagnostics(jl, ir, selected_mode, parallel_flavor, unsafe)
 
     result_sym = _lower_comprehension(
-        jl, ir, mode=selected_mode, parallel_flavor=parallel_flavor, unsafe=unsafe
+        jl,
+        ir,
+        mode=selected_mode,
+        parallel_flavor=parallel_flavor,
+        unsafe=unsafe,
+        accumulator=accumulator,
     )
     jl.w(f"return {result_sym}")
 
@@ -124,32 +154,60 @@ def _add_diagnostics(jl: JL, ir: IRComp, mode: str, parallel_flavor: str, unsafe
 
 
 def _lower_comprehension(
-    jl: JL, ir: IRComp, mode: str, parallel_flavor: str, unsafe: bool
+    jl: JL,
+    ir: IRComp,
+    mode: str,
+    parallel_flavor: str,
+    unsafe: bool,
+    accumulator: str = "thread_local_array",
 ) -> str:
     """Lower a comprehension to Julia code"""
     if len(ir.generators) == 1:
         gen = ir.generators[0]
-        return _lower_single_generator(jl, ir, gen, mode, parallel_flavor, unsafe)
+        return _lower_single_generator(
+            jl, ir, gen, mode, parallel_flavor, unsafe, accumulator
+        )
     else:
         # Handle nested comprehensions
         return _lower_nested_comprehension(jl, ir, mode, parallel_flavor, unsafe)
 
 
+def _fused_generator(ir: IRComp, gen: IRGenerator) -> IRGenerator:
+    """`gen` with `var % K == R` filters folded into its range stride
+
+    Uses the shared lowering plan, so Julia loops visit the same values as
+    the Go and Rust ones.
+    """
+    if not isinstance(gen.source, IRRange):
+        return gen
+    plan = lower_plan(ir)
+    if plan.filters == tuple(gen.filters):
+        return gen
+    return IRGenerator(gen.var, IRRange(*plan.bounds), list(plan.filters))
+
+
 def _lower_single_generator(
-    jl: JL, ir: IRComp, gen: IRGenerator, mode: str, parallel_flavor: str, unsafe: bool
+    jl: JL,
+    ir: IRComp,
+    gen: IRGenerator,
+    mode: str,
+    parallel_flavor: str,
+    unsafe: bool,
+    accumulator: str = "thread_local_array",
 ) -> str:
     """Lower a single generator comprehension"""
-    # Generate the source range
-    source_sym = _lower_source(jl, gen.source)
-
     # Choose between loop and broadcast modes
     if mode == "broadcast" and _should_use_broadcast(ir, gen):
+        source_sym = _lower_source(jl, gen.source)
         return _lower_broadcast(jl, ir, gen, source_sym, parallel_flavor, unsafe)
     else:
-        # Handle different operations in loop mode
+        # Handle different operations in loop mode. Broadcasts already mask
+        # filters branchlessly; loops instead skip to the matching values.
+        gen = _fused_generator(ir, gen)
+        source_sym = _lower_source(jl, gen.source)
         if ir.reduce:
             return _lower_reduction(
-                jl, ir, gen, source_sym, mode, parallel_flavor, unsafe
+                jl, ir, gen, source_sym, mode, parallel_flavor, unsafe, accumulator
             )
         else:
             return _lower_collection(
@@ -160,9 +218,7 @@ def _lower_single_generator(
 def _should_use_broadcast(ir: IRComp, gen: IRGenerator) -> bool:
     """Determine if broadcast mode is appropriate for this IR"""
     # Use broadcast for simple element-wise operations
-    if ir.element and not any(
-        char in ir.element for char in ["if", "else", "and", "or"]
-    ):
+    if ir.element and not _CTRL_PAT.search(ir.element):
         return True
     # Use broadcast for simple reductions without complex filters
     if ir.reduce and not gen.filters:
@@ -198,30 +254,23 @@ def _lower_broadcast_reduction(
     unsafe: bool,
 ) -> str:
     """Lower reduction using broadcast operations"""
+    reducer, identity = BROADCAST_REDUCERS.get(ir.reduce.kind, ("sum", "0"))
+    if ir.element:
+        mapped_expr = _lower_expression(ir.element, gen.var)
+    else:
+        mapped_expr = gen.var
 
     if gen.filters:
         # Use ifelse for dot-fusion: sum(ifelse.(condition, values, 0))
         filter_expr = _lower_expression(gen.filters[0], gen.var)
-        if ir.element:
-            mapped_expr = _lower_expression(ir.element, gen.var)
-        else:
-            mapped_expr = gen.var
-
-        # Create broadcast expression
-        broadcast_expr = f"ifelse.({filter_expr}, {mapped_expr}, 0)"
-        result_sym = gensym("result")
-        jl.w(f"{result_sym} = sum({broadcast_expr})")
-        return result_sym
+        broadcast_expr = f"ifelse.({filter_expr}, {mapped_expr}, {identity})"
     else:
         # Simple broadcast reduction
-        if ir.element:
-            mapped_expr = _lower_expression(ir.element, gen.var)
-        else:
-            mapped_expr = gen.var
+        broadcast_expr = mapped_expr
 
-        result_sym = gensym("result")
-        jl.w(f"{result_sym} = sum({mapped_expr})")
-        return result_sym
+    result_sym = gensym("result")
+    jl.w(f"{result_sym} = {reducer}({broadcast_expr})")
+    return result_sym
 
 
 def _lower_broadcast_collection(
@@ -277,11 +326,16 @@ def _lower_reduction(
     mode: str,
     parallel_flavor: str,
     unsafe: bool,
+    accumulator: str = "thread_local_array",
 ) -> str:
     """Lower reduction operations"""
     reduce_op = ir.reduce
 
     if parallel_flavor == "threadlocals":
+        if accumulator == "reduction_closure":
+            return _lower_task_local_reduction(
+                jl, ir, gen, source_sym, reduce_op, unsafe
+            )
         return _lower_parallel_reduction(jl, ir, gen, source_sym, reduce_op, unsafe)
     else:
         return _lower_sequential_reduction(jl, ir, gen, source_sym, reduce_op, unsafe)
@@ -357,8 +411,46 @@ def _lower_parallel_reduction(
 
     # Combine thread-local partials
     jl.w(f"{acc_sym} = {_get_reduction_identity(reduce_op.kind)}")
-    bounds_check = "@inbounds" if unsafe else ""
-    with jl.block(f"{bounds_check} for p in {parts_sym}"):
+    bounds_check = "@inbounds " if unsafe else ""
+    with jl.block(f"{bounds_check}for p in {parts_sym}"):
+        _apply_reduction(jl, acc_sym, "p", reduce_op.kind)
+
+    return acc_sym
+
+
+def _lower_task_local_reduction(
+    jl: JL, ir: IRComp, gen: IRGenerator, source_sym: str, reduce_op, unsafe: bool
+) -> str:
+    """Lower parallel reduction with one contiguous chunk and local accumulator per task"""
+    parts_sym = gensym("parts")
+    n_sym = gensym("n")
+    nt_sym = gensym("nt")
+    task_sym = gensym("t")
+    local_sym = gensym("tacc")
+    acc_sym = gensym("acc")
+    identity = _get_reduction_identity(reduce_op.kind)
+
+    jl.w(f"{nt_sym} = nthreads()")
+    jl.w(f"{n_sym} = length({source_sym})")
+    jl.w(f"{parts_sym} = fill({identity}, {nt_sym})")
+
+    # Each task accumulates in a local and publishes once, so tasks never
+    # write to neighbouring slots of the parts array inside the hot loop
+    with jl.block(f"@threads for {task_sym} in 1:{nt_sym}"):
+        jl.w(f"{local_sym} = {identity}")
+        chunk = (
+            f"({source_sym})[div(({task_sym} - 1) * {n_sym}, {nt_sym}) + 1"
+            f":div({task_sym} * {n_sym}, {nt_sym})]"
+        )
+        loop_prefix = _reduction_loop_prefix(reduce_op.kind, gen, unsafe)
+        with jl.block(f"{loop_prefix}for {gen.var} in {chunk}"):
+            _emit_reduction_body(jl, ir, gen, local_sym, reduce_op.kind)
+        jl.w(f"{parts_sym}[{task_sym}] = {local_sym}")
+
+    # Combine per-task partials
+    jl.w(f"{acc_sym} = {identity}")
+    bounds_check = "@inbounds " if unsafe else ""
+    with jl.block(f"{bounds_check}for p in {parts_sym}"):
         _apply_reduction(jl, acc_sym, "p", reduce_op.kind)
 
     return acc_sym
@@ -373,30 +465,49 @@ def _lower_sequential_reduction(
     # Initialize accumulator
     jl.w(f"{acc_sym} = {_get_reduction_identity(reduce_op.kind)}")
 
+    plan = lower_plan(ir)
+    if plan.tiled():
+        # Strip-mine array-indexing sums into cache-sized tiles
+        start, stop, _ = plan.bounds
+        tile_sym = gensym("tile")
+        loop_prefix = _reduction_loop_prefix(reduce_op.kind, gen, unsafe)
+        with jl.block(f"for {tile_sym} in {start}:{TILE_SIZE}:{stop - 1}"):
+            tile_range = f"{tile_sym}:min({tile_sym} + {TILE_SIZE - 1}, {stop - 1})"
+            with jl.block(f"{loop_prefix}for {gen.var} in {tile_range}"):
+                _emit_reduction_body(jl, ir, gen, acc_sym, reduce_op.kind)
+        return acc_sym
+
     # Generate the loop
-    with jl.block(f"for {gen.var} in {source_sym}"):
-        # Apply filters
-        if gen.filters:
-            # Has filters - apply reduction only when filter passes
-            for filter_expr in gen.filters:
-                with jl.block(f"if {_lower_expression(filter_expr, gen.var)}"):
-                    # Apply the reduction
-                    if ir.element:
-                        mapped = _lower_expression(ir.element, gen.var)
-                    else:
-                        mapped = gen.var
+    loop_prefix = _reduction_loop_prefix(reduce_op.kind, gen, unsafe)
+    with jl.block(f"{loop_prefix}for {gen.var} in {source_sym}"):
+        _emit_reduction_body(jl, ir, gen, acc_sym, reduce_op.kind)
 
-                    _apply_reduction(jl, acc_sym, mapped, reduce_op.kind)
-        else:
-            # No filters, apply reduction directly
-            if ir.element:
-                mapped = _lower_expression(ir.element, gen.var)
-            else:
-                mapped = gen.var
+    return acc_sym
 
-            _apply_reduction(jl, acc_sym, mapped, reduce_op.kind)
 
-    return acc_sym
+def _reduction_loop_prefix(reduce_kind: str, gen: IRGenerator, unsafe: bool) -> str:
+    """Macros to put in front of a reduction loop (with trailing space, or empty)"""
+    numeric = reduce_kind in _SIMD_REDUCTIONS
+    macros = []
+    if unsafe:
+        macros += ["@fastmath", "@inbounds"] if numeric else ["@inbounds"]
+    if numeric and not gen.filters:
+        # A bare accumulate vectorizes; a filter branch in the body would not
+        macros.append("@simd")
+    return " ".join(macros) + " " if macros else ""
+
+
+def _emit_reduction_body(
+    jl: JL, ir: IRComp, gen: IRGenerator, acc_sym: str, reduce_kind: str
+):
+    """Emit the filtered accumulate step of a reduction loop"""
+    mapped = _lower_expression(ir.element, gen.var) if ir.element else gen.var
+    if gen.filters:
+        for filter_expr in gen.filters:
+            with jl.block(f"if {_lower_expression(filter_expr, gen.var)}"):
+                _apply_reduction(jl, acc_sym, mapped, reduce_kind)
+    else:
+        _apply_reduction(jl, acc_sym, mapped, reduce_kind)
 
 
 def _get_reduction_identity(kind: str) -> str:
@@ -551,8 +662,8 @@ def _lower_parallel_group_by(
 
     # Merge shards serially
     jl.w(f"{result_sym} = Dict{{Int, Vector{{Int}}}}()")
-    bounds_check = "@inbounds" if unsafe else ""
-    with jl.block(f"{bounds_check} for sh in {shards_sym}"):
+    bounds_check = "@inbounds " if unsafe else ""
+    with jl.block(f"{bounds_check}for sh in {shards_sym}"):
         with jl.block("for (k, v) in sh"):
             jl.w(f"dst = get!({result_sym}, k, Vector{{Int}}())")
             jl.w("append!(dst, v)")
@@ -2,14 +2,48 @@
 Centralized strategy selection for Julia code generation
 """
 
-from typing import Optional
+import ast
+from functools import lru_cache
+from typing import NamedTuple, Optional
 
-from ...core import IRComp
+from ...core import IRComp, IRRange
 from .associativity import (
     get_parallel_note,
     is_associative,
 )
 
+# Expression nodes that introduce data-dependent control flow
+_CONTROL_FLOW_NODES = (ast.IfExp, ast.BoolOp)
+
+# Below this many elements, thread spawn and partial merging outweigh the win
+_PARALLEL_MIN_N = 10_000
+
+# Fused broadcasts this deep compile slower than the equivalent loop
+_MAX_FUSED_OPS = 4
+
+# Reductions whose partials can live in a task-local accumulator
+_REDUCTION_OPS = frozenset({"sum", "prod", "max", "min", "any", "all"})
+
+
+class _NodeSig(NamedTuple):
+    """Hashable view of the IRComp fields that strategy selection reads"""
+
+    kind: str
+    has_reduce: bool
+    element: Optional[str]
+    has_filters: bool
+    filters: tuple[tuple[str, ...], ...]  # one tuple per generator
+
+
+def _node_signature(node: IRComp) -> _NodeSig:
+    return _NodeSig(
+        node.kind,
+        node.reduce is not None,
+        node.element,
+        node.has_filters,
+        tuple(tuple(gen.filters) for gen in node.generators),
+    )
+
 
 def choose_strategy(
     node: IRComp,
@@ -20,138 +54,230 @@ def choose_strategy(
     elem_type: str = "Int",
     parallel_requested: bool,
     explain: bool = True,
-) -> tuple[str, str, str]:
+) -> tuple[str, str, str, str]:
     """
     Centralized strategy selection for Julia code generation
 
     Returns:
-        (mode, parallel_flavor, explanation)
+        (mode, parallel_flavor, explanation, accumulator)
         - mode: "loops" or "broadcast"
         - parallel_flavor: "sequential", "threadlocals", or "sharded"
         - explanation: NOTE comment explaining the decision
+        - accumulator: "reduction_closure" (per-task local accumulator,
+          one write per task), "thread_local_array" (per-thread slots or
+          shards), or "none" when sequential
     """
+    # Selection is pure in these inputs, so repeated lowerings of the same
+    # IR shape hit the cache instead of re-running the heuristics
+    return _choose_strategy_cached(
+        _node_signature(node),
+        user_mode,
+        elem_count_hint,
+        op_kind,
+        elem_type,
+        parallel_requested,
+        explain,
+    )
 
+
+@lru_cache(maxsize=1024)
+def _choose_strategy_cached(
+    node: _NodeSig,
+    user_mode: str,
+    elem_count_hint: Optional[int],
+    op_kind: Optional[str],
+    elem_type: str,
+    parallel_requested: bool,
+    explain: bool,
+) -> tuple[str, str, str, str]:
     # 1) Mode selection
+    mode_reason = None  # which auto-mode rule fired, if any
+    fusion_depth = None
     if user_mode in ("loops", "broadcast"):
         mode = user_mode
-        mode_explanation = ""
     else:
         # Auto mode heuristics
         small = (elem_count_hint or 0) <= 10_000
-        no_filters = not any(gen.filters for gen in node.generators)
-
-        if small and no_filters and (node.kind in {"list", "set"} or node.reduce):
-            mode = "broadcast"
-            mode_explanation = (
-                f"# NOTE: auto-selected broadcast mode for small N={elem_count_hint}"
-            )
+        no_filters = not node.has_filters
+
+        eligible = (
+            small and no_filters and (node.kind in {"list", "set"} or node.has_reduce)
+        )
+        fusion_depth = _binop_count(node.element) if node.element else None
+
+        if eligible and fusion_depth is None:
+            # Nothing (or nothing parseable) to measure the fusion depth of
+            mode, mode_reason = "loops", "element"
+        elif eligible and fusion_depth >= _MAX_FUSED_OPS:
+            mode, mode_reason = "loops", "fusion"
+        elif eligible:
+            mode, mode_reason = "broadcast", "small"
         else:
-            mode = "loops"
-            mode_explanation = (
-                f"# NOTE: auto-selected loops mode for {node.kind} operation"
-            )
+            mode, mode_reason = "loops", "kind"
 
     # 2) Parallelization gate
     assoc_ok = is_associative(op_kind, elem_type) if op_kind else False
     # Dict/group operations are always parallelizable if requested (no associativity needed)
     dict_ok = node.kind in {"dict", "group_by"}
+    # Only analysed when parallelism is requested; reused by the fallback below
+    no_deps = bool(parallel_requested) and _sig_has_no_cross_iteration_deps(node)
+    big_enough = elem_count_hint is None or elem_count_hint >= _PARALLEL_MIN_N
     can_parallel = bool(
-        parallel_requested
-        and (assoc_ok or dict_ok)
-        and _has_no_cross_iteration_deps(node)
+        parallel_requested and (assoc_ok or dict_ok) and no_deps and big_enough
     )
 
     # 3) Parallel flavor selection
     if node.kind in {"dict", "group_by"}:
         parallel_flavor = "sharded" if can_parallel else "sequential"
         mode = "loops"  # force loops for dict/group operations
-        if can_parallel:
-            parallel_explanation = (
-                "# NOTE: parallelized with shard-merge pattern (thread-local writes)"
-            )
-        else:
-            parallel_explanation = ""
     else:
         parallel_flavor = "threadlocals" if can_parallel else "sequential"
-        if can_parallel:
-            parallel_explanation = "# NOTE: parallelized with thread-local partials"
+
+    # Accumulators built inside each task avoid false sharing on a
+    # parts[threadid()] array that every iteration would write to
+    if parallel_flavor == "threadlocals" and op_kind in _REDUCTION_OPS:
+        accumulator = "reduction_closure"
+    elif parallel_flavor != "sequential":
+        accumulator = "thread_local_array"
+    else:
+        accumulator = "none"
+
+    if not explain:
+        # Nothing below affects the decision; skip the string formatting
+        return mode, parallel_flavor, "", accumulator
+
+    # 4) Explanations
+    if mode_reason == "fusion":
+        mode_explanation = (
+            f"# NOTE: auto-selected loops due to broadcast fusion depth={fusion_depth}"
+        )
+    elif mode_reason == "element":
+        if node.element:
+            mode_explanation = (
+                "# NOTE: auto-selected loops: element expression not analysable"
+                " for broadcast fusion"
+            )
         else:
-            parallel_explanation = ""
+            mode_explanation = (
+                "# NOTE: auto-selected loops: no element expression to broadcast"
+            )
+    elif mode_reason == "small":
+        mode_explanation = (
+            f"# NOTE: auto-selected broadcast mode for small N={elem_count_hint}"
+        )
+    elif mode_reason == "kind":
+        mode_explanation = f"# NOTE: auto-selected loops mode for {node.kind} operation"
+    else:
+        mode_explanation = ""
 
-    # 4) Fallback explanations
-    if parallel_requested and not can_parallel:
-        if not assoc_ok and not dict_ok:
-            parallel_explanation = get_parallel_note(op_kind, elem_type)
-        elif not _has_no_cross_iteration_deps(node):
-            parallel_explanation = "# NOTE: parallel fallback → sequential: cross-iteration dependencies detected"
+    if parallel_flavor == "sharded":
+        parallel_explanation = (
+            "# NOTE: parallelized with shard-merge pattern (thread-local writes)"
+        )
+    elif parallel_flavor == "threadlocals":
+        parallel_explanation = "# NOTE: parallelized with thread-local partials"
+    elif not parallel_requested:
+        parallel_explanation = ""
+    # Fallback explanations
+    elif not assoc_ok and not dict_ok:
+        parallel_explanation = get_parallel_note(op_kind, elem_type)
+    elif not no_deps:
+        parallel_explanation = "# NOTE: parallel fallback → sequential: cross-iteration dependencies detected"
+    else:
+        parallel_explanation = f"# NOTE: parallel fallback → sequential: N={elem_count_hint} too small to amortize thread spawn"
 
     # Combine explanations
-    explanations = [e for e in [mode_explanation, parallel_explanation] if e]
-    explanation = "\n".join(explanations) if explanations and explain else ""
-
-    return mode, parallel_flavor, explanation
+    if mode_explanation and parallel_explanation:
+        return (
+            mode,
+            parallel_flavor,
+            f"{mode_explanation}\n{parallel_explanation}",
+            accumulator,
+        )
+    return mode, parallel_flavor, mode_explanation or parallel_explanation, accumulator
 
 
 def _has_no_cross_iteration_deps(node: IRComp) -> bool:
     """Check if the node has no cross-iteration dependencies"""
+    return _sig_has_no_cross_iteration_deps(_node_signature(node))
+
+
+@lru_cache(maxsize=1024)
+def _sig_has_no_cross_iteration_deps(node: _NodeSig) -> bool:
     # For now, assume simple cases are safe
     # TODO: More sophisticated analysis for complex nested operations
-    if not node.generators:
+    if not node.filters:  # no generators
         return True
 
-    gen = node.generators[0]
-
     # Check for complex expressions that might have dependencies
-    if node.element and any(
-        char in node.element for char in ["if", "else", "and", "or"]
-    ):
+    if node.element and _expr_has_control_flow(node.element):
         return False
 
     # Check for complex filters
-    for filter_expr in gen.filters:
-        if any(char in filter_expr for char in ["if", "else", "and", "or"]):
+    for filter_expr in node.filters[0]:
+        if _expr_has_control_flow(filter_expr):
             return False
 
     return True
 
 
-def get_elem_count_hint(node: IRComp) -> Optional[int]:
-    """Estimate element count for strategy selection with cost model"""
-    if not node.generators:
+@lru_cache(maxsize=1024)
+def _expr_has_control_flow(expr: str) -> bool:
+    """Check an expression for conditionals, boolean operators or filtered comprehensions"""
+    try:
+        tree = ast.parse(expr, mode="eval")
+    except SyntaxError:
+        return True  # can't analyse it, so don't claim it's safe
+
+    for n in ast.walk(tree):
+        if isinstance(n, _CONTROL_FLOW_NODES):
+            return True
+        if isinstance(n, ast.comprehension) and n.ifs:
+            return True
+    return False
+
+
+@lru_cache(maxsize=1024)
+def _binop_count(expr: str) -> Optional[int]:
+    """Number of binary operators a broadcast of this expression would fuse"""
+    try:
+        tree = ast.parse(expr, mode="eval")
+    except SyntaxError:
         return None
+    return sum(isinstance(n, ast.BinOp) for n in ast.walk(tree))
 
-    gen = node.generators[0]
-
-    # Try to get size hint from node attributes first
-    if hasattr(node, "range_len"):
-        return node.range_len
-
-    # Simple range estimation
-    if hasattr(gen.source, "start") and hasattr(gen.source, "stop"):
-        return gen.source.stop - gen.source.start
 
+def _range_len(node: IRComp) -> Optional[int]:
+    """Span of the first generator's range source, if it is a range"""
+    if node.generators:
+        source = node.generators[0].source
+        if isinstance(source, IRRange):
+            return source.stop - source.start
     return None
 
 
-def size_hint(node: IRComp) -> Optional[int]:
-    """Cost model hook for size estimation"""
-    # Try to propagate |range|, filter selectivity, etc.
-    if hasattr(node, "range_len"):
-        return node.range_len
+def get_elem_count_hint(node: IRComp) -> Optional[int]:
+    """Estimate element count for strategy selection with cost model"""
+    if not node.generators:
+        return None
 
-    # Estimate from generators
-    if node.generators:
-        gen = node.generators[0]
-        if hasattr(gen.source, "start") and hasattr(gen.source, "stop"):
-            base_size = gen.source.stop - gen.source.start
+    # Simple range estimation. IR nodes are slotted, so there is no ad-hoc
+    # range_len attribute to override this with.
+    return _range_len(node)
 
-            # Apply filter selectivity estimate
-            if gen.filters:
-                # Conservative estimate: filters reduce size by ~50%
-                return int(base_size * 0.5)
-            return base_size
 
-    return None  # unknown
+def size_hint(node: IRComp) -> Optional[int]:
+    """Cost model hook for size estimation"""
+    # Estimate |range| and filter selectivity from the generators
+    base_size = _range_len(node)
+    if base_size is None:
+        return None  # unknown
+
+    # Apply filter selectivity estimate
+    if node.generators[0].filters:
+        # Conservative estimate: filters reduce size by ~50%
+        return int(base_size * 0.5)
+    return base_size
 
 
 def get_op_kind(node: IRComp) -> Optional[str]:
@@ -2,6 +2,8 @@
 Julia type mapping and type inference
 """
 
+import re
+from functools import lru_cache
 from typing import Optional
 
 # Type mapping from Python/IR types to Julia types
@@ -16,7 +18,38 @@ type_mapping = {
     "set": "Set",
 }
 
+# Operators whose result is treated as Float64 (`**` is covered by `*`)
+_FLOAT_OPS = re.compile(r"[*/^]")
 
+
+def _vector_type(element_type, key_type, value_type):
+    if not element_type:
+        return None
+    return f"Vector{{{type_mapping.get(element_type, element_type)}}}"
+
+
+def _dict_type(element_type, key_type, value_type):
+    if not (key_type and value_type):
+        return None
+    key_julia = type_mapping.get(key_type, key_type)
+    value_julia = type_mapping.get(value_type, value_type)
+    return f"Dict{{{key_julia}, {value_julia}}}"
+
+
+def _tuple_type(element_type, key_type, value_type):
+    # Handle simple tuples
+    return f"Tuple{{{element_type}}}" if element_type else None
+
+
+# Parameterized formatters by IR type; None means "use the bare base type"
+_TYPE_FORMATTERS = {
+    "list": _vector_type,
+    "dict": _dict_type,
+    "tuple": _tuple_type,
+}
+
+
+@lru_cache(maxsize=512)
 def julia_type(
     ir_type: str,
     element_type: Optional[str] = None,
@@ -24,33 +57,22 @@ def julia_type(
     value_type: Optional[str] = None,
 ) -> str:
     """Convert IR type to Julia type annotation"""
-    base_type = type_mapping.get(ir_type, ir_type)
-
-    if ir_type == "list" and element_type:
-        element_julia = type_mapping.get(element_type, element_type)
-        return f"Vector{{{element_julia}}}"
-    elif ir_type == "dict" and key_type and value_type:
-        key_julia = type_mapping.get(key_type, key_type)
-        value_julia = type_mapping.get(value_type, value_type)
-        return f"Dict{{{key_julia}, {value_julia}}}"
-    elif ir_type == "tuple" and element_type:
-        # Handle simple tuples
-        return f"Tuple{{{element_type}}}"
-    else:
-        return base_type
+    formatter = _TYPE_FORMATTERS.get(ir_type)
+    if formatter is not None:
+        formatted = formatter(element_type, key_type, value_type)
+        if formatted is not None:
+            return formatted
+    return type_mapping.get(ir_type, ir_type)
 
 
+@lru_cache(maxsize=1024)
 def infer_type_from_expression(expr: str) -> str:
     """Infer Julia type from expression"""
-    # Simple type inference based on expression patterns
-    if "**" in expr or "^" in expr:
-        return "Float64"  # Exponentiation often results in floats
-    elif "*" in expr or "/" in expr:
-        return "Float64"  # Multiplication/division can produce floats
-    elif "+" in expr or "-" in expr:
-        return "Int"  # Addition/subtraction of integers
-    else:
-        return "Int"  # Default to Int
+    # Exponentiation, multiplication and division can produce floats;
+    # anything else (addition/subtraction, bare values) defaults to Int
+    if _FLOAT_OPS.search(expr):
+        return "Float64"
+    return "Int"
 
 
 def get_collection_type(kind: str, element_type: str = "Int") -> str:
@@ -4,13 +4,19 @@ Command-line interface for Polyglot Code Sampler
 
 import argparse
 import sys
+import time
+from functools import lru_cache
 
 from .core import PyToIR
-from .renderer_api import render as render_generic
 
+# Wall-clock limit for --execute-sql; recursive CTEs over huge ranges can run
+# practically forever
+_SQL_TIMEOUT_S = 10
 
-def main():
-    """Main CLI entry point"""
+
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser (constructed once per process)"""
     parser = argparse.ArgumentParser(
         description="Polyglot Code Sampler - Transform Python comprehensions across 6 ecosystems",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -73,16 +79,27 @@ Examples:
     )
 
     parser.add_argument(
-        "--int-type", default="i32", help="Integer type for Rust (default: i32)"
+        "--int-type",
+        default="i32",
+        help="Integer type for Rust, or 'auto' to infer the narrowest "
+        "overflow-free one from the range (default: i32)",
     )
 
     parser.add_argument(
         "--strict-types", action="store_true", help="Enable strict type checking"
     )
 
-    args = parser.parse_args()
+    return parser
+
+
+def main():
+    """Main CLI entry point"""
+    args = _build_parser().parse_args()
 
     try:
+        # Imported here so `--help` and argument errors skip the renderer graph
+        from .renderer_api import render as render_generic
+
         # Parse Python code to IR
         parser_obj = PyToIR()
         ir = parser_obj.parse(args.code)
@@ -112,6 +129,62 @@ Examples:
 
 def execute_sql_and_display(sql: str):
     """Execute SQL and display results"""
+    try:
+        import sqlite3
+    except ImportError:
+        # Python built without _sqlite3: fall back to the sqlite3 binary
+        _execute_sql_subprocess(sql)
+        return
+
+    conn = sqlite3.connect(":memory:")
+    deadline = time.monotonic() + _SQL_TIMEOUT_S
+    # A truthy return interrupts the running statement
+    conn.set_progress_handler(lambda: time.monotonic() > deadline, 10_000)
+    rows = []
+    error = None
+    try:
+        for statement in _split_sql_statements(sql):
+            cursor = conn.execute(statement)
+            if cursor.description is not None:
+                rows.extend(cursor.fetchall())
+    except sqlite3.Error as e:
+        if time.monotonic() > deadline:
+            error = "SQL execution timed out"
+        else:
+            error = f"SQL Error: {e}"
+    except Exception as e:
+        error = f"Error executing SQL: {e}"
+    finally:
+        conn.close()
+
+    # Rows from statements that completed are still shown before any error
+    if rows or error is None:
+        # Match the sqlite3 shell's default list output ("a|b" per row)
+        output = "".join(
+            "|".join("" if v is None else str(v) for v in row) + "\n" for row in rows
+        )
+        print("SQL Results:")
+        print(output)
+    if error is not None:
+        print(error)
+
+
+def _split_sql_statements(sql: str):
+    """Yield complete SQL statements; a trailing statement may omit its ';'"""
+    import sqlite3
+
+    pending = ""
+    for line in sql.splitlines(keepends=True):
+        pending += line
+        if sqlite3.complete_statement(pending):
+            yield pending
+            pending = ""
+    if pending.strip():
+        yield pending
+
+
+def _execute_sql_subprocess(sql: str):
+    """Execute SQL through the sqlite3 command-line shell"""
     import subprocess
 
     try:
@@ -120,7 +193,7 @@ def execute_sql_and_display(sql: str):
             input=sql,
             text=True,
             capture_output=True,
-            timeout=10,
+            timeout=_SQL_TIMEOUT_S,
         )
 
         if result.returncode == 0:
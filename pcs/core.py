@@ -6,39 +6,49 @@ from __future__ import annotations
 
 import ast
 import json
-from dataclasses import asdict, dataclass
+import sys
+from dataclasses import dataclass
 from typing import Any
 
+try:  # optional: faster JSON encoding for IR dumps
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+# IR nodes are allocated per parse; slots drop the per-instance __dict__
+# where the running interpreter supports it (3.10+)
+DATACLASS_OPTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**DATACLASS_OPTS)
 class IRRange:
     start: int
     stop: int
     step: int = 1
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTS)
 class IRGenerator:
     var: str
     source: IRRange | str
     filters: list[str]
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTS)
 class IRReduce:
     kind: str
     op: str | None = None
     initial: str | None = None
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTS)
 class TypeInfo:
     element_type: str = "int"
     key_type: str = "int"
     value_type: str = "int"
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTS)
 class IRComp:
     kind: str
     generators: list[IRGenerator]
@@ -48,31 +58,93 @@ class IRComp:
     reduce: IRReduce | None = None
     provenance: dict = None
 
-    def to_json(self) -> str:
-        def to_dict(obj: Any):
-            if hasattr(obj, "__dataclass_fields__"):
-                d = asdict(obj)
-                d["__type__"] = obj.__class__.__name__
-                return d
-            elif isinstance(obj, list):
-                return [to_dict(x) for x in obj]
-            else:
-                return obj
+    @property
+    def has_filters(self) -> bool:
+        """Whether any generator filters, read live so mutated IR stays right"""
+        return any(gen.filters for gen in self.generators)
+
+    def cache_key(self) -> tuple:
+        """Hashable snapshot of this IR, for memoizing renderers"""
+        return (
+            self.kind,
+            tuple(
+                (
+                    gen.var,
+                    (
+                        (gen.source.start, gen.source.stop, gen.source.step)
+                        if isinstance(gen.source, IRRange)
+                        else gen.source
+                    ),
+                    tuple(gen.filters),
+                )
+                for gen in self.generators
+            ),
+            self.element,
+            self.key_expr,
+            self.val_expr,
+            (
+                (self.reduce.kind, self.reduce.op, self.reduce.initial)
+                if self.reduce
+                else None
+            ),
+            tuple(sorted(self.provenance.items())) if self.provenance else None,
+        )
+
+    def to_json(self, pretty: bool = True) -> str:
+        d = _to_plain(self)
+        d["__type__"] = type(self).__name__
+        if orjson is not None:
+            try:
+                option = orjson.OPT_INDENT_2 if pretty else 0
+                return orjson.dumps(d, option=option).decode()
+            except orjson.JSONEncodeError:
+                pass  # e.g. range bounds beyond 64-bit; json handles those
+        # Byte-identical to orjson's output: its separators, raw UTF-8
+        return json.dumps(
+            d,
+            indent=2 if pretty else None,
+            separators=(",", ": ") if pretty else (",", ":"),
+            ensure_ascii=False,
+        )
+
 
-        return json.dumps(to_dict(self), indent=2)
+def _to_plain(obj: Any) -> Any:
+    """Convert IR dataclasses to plain JSON-ready values in a single pass"""
+    if hasattr(obj, "__dataclass_fields__"):
+        return {f: _to_plain(getattr(obj, f)) for f in obj.__dataclass_fields__}
+    elif isinstance(obj, list):
+        return [_to_plain(x) for x in obj]
+    elif isinstance(obj, dict):
+        return {k: _to_plain(v) for k, v in obj.items()}
+    else:
+        return obj
 
 
 class PyToIR:
-    def parse(self, code: str) -> IRComp:
-        tree = ast.parse(code)
-        if len(tree.body) != 1:
-            raise ValueError("Expected single expression")
+    # UTF-8 lines of the source being parsed; AST column offsets are byte offsets
+    _source_lines: tuple[bytes, ...] = ()
 
-        expr = tree.body[0]
-        if isinstance(expr, ast.Expr):
-            return self._parse_expr(expr.value)
-        else:
-            raise ValueError("Expected expression")
+    def parse(self, code: str) -> IRComp:
+        self._source_lines = tuple(code.encode("utf-8").splitlines())
+        try:
+            tree = ast.parse(code, mode="eval")
+        except SyntaxError:
+            # Not a bare expression: re-parse as a module for the old diagnostics
+            module = ast.parse(code)
+            if len(module.body) != 1:
+                raise ValueError("Expected single expression") from None
+            raise ValueError("Expected expression") from None
+
+        return self._parse_expr(tree.body)
+
+    def _source_text(self, node: ast.AST) -> str:
+        """Source text of `node`, sliced from the input rather than unparsed"""
+        lineno = node.lineno
+        if lineno == node.end_lineno and lineno <= len(self._source_lines):
+            line = self._source_lines[lineno - 1]
+            return line[node.col_offset : node.end_col_offset].decode("utf-8")
+        # Multi-line spans may carry comments/indentation: normalize instead
+        return ast.unparse(node)
 
     def _parse_expr(self, node: ast.AST) -> IRComp:
         if isinstance(node, ast.ListComp):
@@ -90,7 +162,7 @@ class PyToIR:
 
     def _parse_list_comp(self, node: ast.ListComp) -> IRComp:
         generators = [self._parse_generator(gen) for gen in node.generators]
-        element = ast.unparse(node.elt) if node.elt else None
+        element = self._source_text(node.elt) if node.elt else None
 
         return IRComp(
             kind="list",
@@ -101,8 +173,8 @@ class PyToIR:
 
     def _parse_dict_comp(self, node: ast.DictComp) -> IRComp:
         generators = [self._parse_generator(gen) for gen in node.generators]
-        key_expr = ast.unparse(node.key) if node.key else None
-        val_expr = ast.unparse(node.value) if node.value else None
+        key_expr = self._source_text(node.key) if node.key else None
+        val_expr = self._source_text(node.value) if node.value else None
 
         return IRComp(
             kind="dict",
@@ -114,7 +186,7 @@ class PyToIR:
 
     def _parse_set_comp(self, node: ast.SetComp) -> IRComp:
         generators = [self._parse_generator(gen) for gen in node.generators]
-        element = ast.unparse(node.elt) if node.elt else None
+        element = self._source_text(node.elt) if node.elt else None
 
         return IRComp(
             kind="set",
@@ -125,7 +197,7 @@ class PyToIR:
 
     def _parse_genexp(self, node: ast.GeneratorExp) -> IRComp:
         generators = [self._parse_generator(gen) for gen in node.generators]
-        element = ast.unparse(node.elt) if node.elt else None
+        element = self._source_text(node.elt) if node.elt else None
 
         return IRComp(
             kind="generator",
@@ -150,7 +222,7 @@ class PyToIR:
         if isinstance(arg, ast.GeneratorExp):
             # Parse the generator expression
             generators = [self._parse_generator(gen) for gen in arg.generators]
-            element = ast.unparse(arg.elt) if arg.elt else None
+            element = self._source_text(arg.elt) if arg.elt else None
 
             return IRComp(
                 kind="generator",
@@ -165,7 +237,7 @@ class PyToIR:
     def _parse_generator(self, node: ast.comprehension) -> IRGenerator:
         var = node.target.id if isinstance(node.target, ast.Name) else "x"
         source = self._parse_source(node.iter)
-        filters = [ast.unparse(f) for f in node.ifs]
+        filters = [self._source_text(f) for f in node.ifs]
 
         return IRGenerator(var=var, source=source, filters=filters)
 
@@ -186,13 +258,14 @@ class PyToIR:
                     self._eval_const(args[1]),
                     self._eval_const(args[2]),
                 )
-        return ast.unparse(node)
+        return self._source_text(node)
 
     def _eval_const(self, node: ast.AST) -> int:
         if isinstance(node, ast.Constant):
             return node.value
-        elif isinstance(node, ast.Num):  # Python < 3.8
-            return node.n
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            # Negative literals parse as USub applied to a Constant
+            return -self._eval_const(node.operand)
         else:
             # For non-constant expressions, return a placeholder
             return 10
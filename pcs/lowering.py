@@ -0,0 +1,114 @@
+"""
+Backend-neutral lowering of IR into the facts every loop-based renderer needs
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from math import gcd
+
+from .core import DATACLASS_OPTS, IRComp
+
+_BOOL_REDUCTIONS = frozenset({"any", "all"})
+
+# `var % K == R` filters, which select an arithmetic progression of the range
+_STRIDE_FILTER = re.compile(r"^\s*(\w+)\s*%\s*(\d+)\s*==\s*(\d+)\s*$")
+
+# Iterations per strip when a reduction's loop is tiled for cache locality
+TILE_SIZE = 4096
+
+
+@dataclass(frozen=True, **DATACLASS_OPTS)
+class LoweredPlan:
+    kind: str
+    result: str  # "int", "bool", "list", "set" or "dict"; backends map it to a type
+    reduce: str | None
+    var: str | None  # None unless there is exactly one generator
+    bounds: tuple[int, int, int] | None  # (start, stop, step) of a range source
+    filters: tuple[str, ...]
+    element: str | None
+    key_expr: str | None
+    val_expr: str | None
+    reduce_expr: str  # expression fed to the reduction
+
+    def tiled(self) -> bool:
+        """Whether a sum should be strip-mined into TILE_SIZE blocks
+
+        Only worth it when the body indexes into an array, so neighbouring
+        iterations share cache lines, and the unit-step range spans tiles.
+        """
+        if self.reduce != "sum" or self.bounds is None:
+            return False
+        start, stop, step = self.bounds
+        if step != 1 or stop - start < TILE_SIZE:
+            return False
+        return "[" in self.reduce_expr or any("[" in f for f in self.filters)
+
+
+def _fuse_stride_filters(
+    var: str, bounds: tuple[int, int, int], filters: tuple[str, ...]
+) -> tuple[tuple[int, int, int], tuple[str, ...]]:
+    """Fold `var % K == R` filters into the range's start and step
+
+    The loop then visits only the matching values instead of testing each
+    one. Only non-negative ascending ranges are rewritten, where Python's %
+    agrees with the truncating % of the target languages.
+    """
+    start, stop, step = bounds
+    kept = []
+    for filter_expr in filters:
+        m = _STRIDE_FILTER.match(filter_expr)
+        k = int(m.group(2)) if m else 0
+        if m is None or m.group(1) != var or k == 0 or step <= 0 or start < 0:
+            kept.append(filter_expr)
+            continue
+        r = int(m.group(3))
+        period = k // gcd(step, k)
+        # First value on the step lattice that is congruent to r mod k
+        offset = next((t for t in range(period) if (start + t * step) % k == r), None)
+        if offset is None:
+            stop = start  # nothing can match, e.g. x % 2 == 3
+        else:
+            start += offset * step
+        step *= period
+    return (start, stop, step), tuple(kept)
+
+
+def lower_plan(ir: IRComp) -> LoweredPlan:
+    """Derive the result shape, loop bounds and body expressions of `ir` once"""
+    if ir.reduce:
+        k = ir.reduce.kind
+        result = "bool" if k in _BOOL_REDUCTIONS else "int"
+    else:
+        k = None
+        result = ir.kind if ir.kind in ("list", "set", "dict") else "list"
+
+    var = bounds = None
+    filters: tuple[str, ...] = ()
+    if len(ir.generators) == 1:
+        gen = ir.generators[0]
+        var = gen.var
+        filters = tuple(gen.filters)
+        # Duck-typed so IR from the legacy front end lowers the same way
+        if hasattr(gen.source, "start"):
+            bounds = (gen.source.start, gen.source.stop, gen.source.step)
+            bounds, filters = _fuse_stride_filters(var, bounds, filters)
+
+    if ir.kind == "dict":
+        reduce_expr = ir.val_expr or "0"
+    else:
+        reduce_expr = ir.element or "0"
+
+    return LoweredPlan(
+        kind=ir.kind,
+        result=result,
+        reduce=k,
+        var=var,
+        bounds=bounds,
+        filters=filters,
+        element=ir.element,
+        key_expr=ir.key_expr,
+        val_expr=ir.val_expr,
+        reduce_expr=reduce_expr,
+    )
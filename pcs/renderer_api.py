@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import inspect
-from collections.abc import Callable
+from functools import lru_cache
 from typing import Any, Protocol
 
 from pcs.renderers.csharp import render_csharp  # noqa: F401
@@ -31,11 +31,56 @@ _BACKENDS: dict[str, RendererFn] = {
 }
 
 
-def _filter_kwargs(fn: Callable[..., Any], **kwargs) -> dict[str, Any]:
-    """Return only the kwargs that `fn` actually accepts (tolerates mismatches)."""
-    sig = inspect.signature(fn)
-    accepted = set(sig.parameters.keys())
-    return {k: v for k, v in kwargs.items() if k in accepted}
+# Backend signatures are fixed, so resolve each one's parameter names once
+_ACCEPTED: dict[str, frozenset[str]] = {
+    name: frozenset(inspect.signature(fn).parameters)
+    for name, fn in _BACKENDS.items()
+}
+
+
+class _IRKey:
+    """Carries an IR into the render cache, hashed and compared by its snapshot"""
+
+    __slots__ = ("ir", "key")
+
+    def __init__(self, ir: Any, key: tuple):
+        self.ir = ir
+        self.key = key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _IRKey) and self.key == other.key
+
+
+@lru_cache(maxsize=1024)
+def _render_cached(fn: RendererFn, ir_key: _IRKey, kwargs: tuple) -> str:
+    # Keyed on the backend function itself, so rebinding one misses the cache
+    return fn(ir_key.ir, **dict(kwargs))
+
+
+def _dispatch(fn: RendererFn, ir: Any, kwargs: dict[str, Any]) -> str:
+    """Run a backend on already-filtered kwargs, reusing output for repeat IR"""
+    # Renderers are pure, so identical IR and options give identical source.
+    # IR without a snapshot (e.g. the legacy front end), or with unhashable
+    # options or snapshot contents (e.g. a list in provenance), falls through
+    # to a direct call.
+    cache_key = getattr(ir, "cache_key", None)
+    if cache_key is not None:
+        options = tuple(sorted(kwargs.items()))
+        try:
+            key = cache_key()
+            hash((key, options))
+        except TypeError:
+            return fn(ir, **kwargs)
+        ir_key = _IRKey(ir, key)
+        try:
+            return _render_cached(fn, ir_key, options)
+        finally:
+            # The cache only needs the snapshot; don't keep the IR alive
+            ir_key.ir = None
+    return fn(ir, **kwargs)
 
 
 def render(target: str, ir: Any, **kwargs) -> str:
@@ -45,33 +90,30 @@ def render(target: str, ir: Any, **kwargs) -> str:
       - filters kwargs to match the concrete backend signature
     This prevents test failures from minor signature drift across renderers.
     """
-    if target not in _BACKENDS:
+    fn = _BACKENDS.get(target)
+    if fn is None:
         raise ValueError(f"Unknown target: {target}. Known: {sorted(_BACKENDS)}")
-    fn = _BACKENDS[target]
-    safe_kwargs = _filter_kwargs(fn, **kwargs)
-    return fn(ir, **safe_kwargs)
-
-
-# Optional: per-backend shims so existing imports in tests continue to work
-def render_rust(ir: Any, **kwargs) -> str:
-    return render("rust", ir, **kwargs)
-
+    accepted = _ACCEPTED[target]
+    safe_kwargs = {k: v for k, v in kwargs.items() if k in accepted}
+    return _dispatch(fn, ir, safe_kwargs)
 
-def render_ts(ir: Any, **kwargs) -> str:
-    return render("ts", ir, **kwargs)
 
+def _make_shim(target: str) -> RendererFn:
+    """Bind a backend to its kwarg filter, bypassing render()."""
+    fn = _BACKENDS[target]
+    accepted = _ACCEPTED[target]
 
-def render_go(ir: Any, **kwargs) -> str:
-    return render("go", ir, **kwargs)
-
-
-def render_csharp(ir: Any, **kwargs) -> str:
-    return render("csharp", ir, **kwargs)
-
+    def shim(ir: Any, **kwargs) -> str:
+        return _dispatch(fn, ir, {k: v for k, v in kwargs.items() if k in accepted})
 
-def render_julia(ir: Any, **kwargs) -> str:
-    return render("julia", ir, **kwargs)
+    shim.__name__ = shim.__qualname__ = f"render_{target}"
+    return shim
 
 
-def render_sql(ir: Any, **kwargs) -> str:
-    return render("sql", ir, **kwargs)
+# Optional: per-backend shims so existing imports in tests continue to work
+render_rust = _make_shim("rust")
+render_ts = _make_shim("ts")
+render_go = _make_shim("go")
+render_csharp = _make_shim("csharp")
+render_julia = _make_shim("julia")
+render_sql = _make_shim("sql")
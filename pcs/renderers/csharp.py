@@ -2,7 +2,40 @@
 C# renderer for Polyglot Code Sampler
 """
 
-from ..core import IRComp
+import re
+
+from ..core import IRComp, IRRange
+
+# Basic Python→C# expression tweaks, compiled once
+_CSHARP_REPLACEMENTS = [
+    (re.compile(r"\band\b"), "&&"),
+    (re.compile(r"\bor\b"), "||"),
+    (re.compile(r"\bnot\b"), "!"),
+    (re.compile(r"\bTrue\b"), "true"),
+    (re.compile(r"\bFalse\b"), "false"),
+    (re.compile(r"\*\*"), "Math.Pow"),  # Python ** to C# Math.Pow
+]
+_POW_FIX = re.compile(r"(\w+)\s*Math\.Pow\s*(\w+)")
+
+# Below this many elements PLINQ partitioning costs more than it saves
+_PLINQ_THRESHOLD = 10_000
+
+# Known-size lists up to this length are filled by a plain loop, skipping LINQ
+_ARRAY_LOOP_MAX = 64
+
+
+def _csharp_expr(expr: str) -> str:
+    """Convert a Python expression to C#"""
+    result = expr
+    for pattern, replacement in _CSHARP_REPLACEMENTS:
+        result = pattern.sub(replacement, result)
+
+    # Handle Math.Pow expressions
+    if "Math.Pow" in result:
+        # Convert x**2 to Math.Pow(x, 2)
+        result = _POW_FIX.sub(r"Math.Pow(\1, \2)", result)
+
+    return result
 
 
 def render_csharp(
@@ -11,42 +44,17 @@ def render_csharp(
     """
     C# LINQ backend with PLINQ parallel support:
       list -> List<int> (or List<T> with type inference)
+              int[] when unfiltered, sequential and range-sized
       set  -> HashSet<int>
       dict -> Dictionary<int, int>
       reductions: Sum/Max/Min -> int, Any/All -> bool
     Notes:
       - Uses LINQ for functional transformations
-      - PLINQ (.AsParallel()) for parallel processing
+      - PLINQ (.AsParallel()) for parallel processing of large ranges
       - Type inference for better production code
       - Enterprise-ready C# patterns
     """
 
-    # Helper function to convert Python expressions to C#
-    def csharp_expr(expr: str) -> str:
-        # Basic Python→C# expression tweaks
-        replacements = [
-            (r"\band\b", "&&"),
-            (r"\bor\b", "||"),
-            (r"\bnot\b", "!"),
-            (r"\bTrue\b", "true"),
-            (r"\bFalse\b", "false"),
-            (r"\*\*", "Math.Pow"),  # Python ** to C# Math.Pow
-            (r"==", "=="),
-            (r"!=", "!="),
-        ]
-        import re
-
-        result = expr
-        for pattern, replacement in replacements:
-            result = re.sub(pattern, replacement, result)
-
-        # Handle Math.Pow expressions
-        if "Math.Pow" in result:
-            # Convert x**2 to Math.Pow(x, 2)
-            result = re.sub(r"(\w+)\s*Math\.Pow\s*(\w+)", r"Math.Pow(\1, \2)", result)
-
-        return result
-
     # Determine output type
     if ir.reduce:
         k = ir.reduce.kind
@@ -66,6 +74,21 @@ def render_csharp(
         else:
             return_type = "List<int>"
 
+    # Unfiltered sequential lists over a range have a size known here, so
+    # they are returned as a pre-sized array instead of a growable List<int>
+    array_len = None
+    if (
+        ir.kind == "list"
+        and not ir.reduce
+        and not parallel
+        and len(ir.generators) == 1
+        and isinstance(ir.generators[0].source, IRRange)
+        and not ir.generators[0].filters
+    ):
+        src = ir.generators[0].source
+        array_len = len(range(src.start, src.stop, src.step))
+        return_type = "int[]"
+
     # Build the LINQ chain
     lines = []
 
@@ -84,7 +107,19 @@ def render_csharp(
     lines.append("    {")
 
     # Build the source range
-    if len(ir.generators) == 1 and hasattr(ir.generators[0].source, "start"):
+    if array_len is not None and array_len < _ARRAY_LOOP_MAX:
+        gen = ir.generators[0]
+        start, step = gen.source.start, gen.source.step
+        elem_csharp = _csharp_expr(ir.element) if ir.element else gen.var
+        lines.append(f"        var _result = new int[{array_len}];")
+        lines.append(f"        for (int _i = 0; _i < {array_len}; _i++)")
+        lines.append("        {")
+        lines.append(f"            int {gen.var} = {start} + _i * {step};")
+        lines.append(f"            _result[_i] = {elem_csharp};")
+        lines.append("        }")
+        lines.append("        return _result;")
+
+    elif len(ir.generators) == 1 and hasattr(ir.generators[0].source, "start"):
         gen = ir.generators[0]
         start, stop, step = gen.source.start, gen.source.stop, gen.source.step
 
@@ -96,17 +131,20 @@ def render_csharp(
                 f"Enumerable.Range(0, {stop - start}).Select(i => {start} + i * {step})"
             )
 
-        # Add parallel prefix if requested
-        if parallel:
-            source = f"{source}.AsParallel()"
+        # PLINQ partitioning only pays off on large, compile-time sized ranges
+        if parallel and len(range(start, stop, step)) >= _PLINQ_THRESHOLD:
+            source = (
+                f"{source}.AsParallel()"
+                ".WithDegreeOfParallelism(Environment.ProcessorCount)"
+            )
 
-        # Build the LINQ chain
-        chain = source
+        # Build the LINQ chain from parts, joined once below
+        chain_parts = [source]
 
         # Add filters
         for filter_expr in gen.filters:
-            filter_csharp = csharp_expr(filter_expr)
-            chain += f".Where({gen.var} => {filter_csharp})"
+            filter_csharp = _csharp_expr(filter_expr)
+            chain_parts.append(f".Where({gen.var} => {filter_csharp})")
 
         # Add the final operation
         if ir.reduce:
@@ -116,39 +154,44 @@ def render_csharp(
             else:
                 expr = ir.element or "0"
 
-            expr_csharp = csharp_expr(expr)
+            expr_csharp = _csharp_expr(expr)
 
             if k == "sum":
-                chain += f".Sum({gen.var} => {expr_csharp})"
+                chain_parts.append(f".Sum({gen.var} => {expr_csharp})")
             elif k == "prod":
-                chain += f".Aggregate(1, (acc, {gen.var}) => acc * {expr_csharp})"
+                chain_parts.append(
+                    f".Aggregate(1, (acc, {gen.var}) => acc * {expr_csharp})"
+                )
             elif k == "max":
-                chain += f".Max({gen.var} => {expr_csharp})"
+                chain_parts.append(f".Max({gen.var} => {expr_csharp})")
             elif k == "min":
-                chain += f".Min({gen.var} => {expr_csharp})"
+                chain_parts.append(f".Min({gen.var} => {expr_csharp})")
             elif k == "any":
-                chain += f".Any({gen.var} => {expr_csharp})"
+                chain_parts.append(f".Any({gen.var} => {expr_csharp})")
             elif k == "all":
-                chain += f".All({gen.var} => {expr_csharp})"
+                chain_parts.append(f".All({gen.var} => {expr_csharp})")
         else:
             # Collection operations
             if ir.kind == "list":
                 if ir.element:
-                    elem_csharp = csharp_expr(ir.element)
-                    chain += f".Select({gen.var} => {elem_csharp})"
-                chain += ".ToList()"
+                    elem_csharp = _csharp_expr(ir.element)
+                    chain_parts.append(f".Select({gen.var} => {elem_csharp})")
+                chain_parts.append(".ToList()" if array_len is None else ".ToArray()")
             elif ir.kind == "set":
                 if ir.element:
-                    elem_csharp = csharp_expr(ir.element)
-                    chain += f".Select({gen.var} => {elem_csharp})"
-                chain += ".ToHashSet()"
+                    elem_csharp = _csharp_expr(ir.element)
+                    chain_parts.append(f".Select({gen.var} => {elem_csharp})")
+                chain_parts.append(".ToHashSet()")
             elif ir.kind == "dict":
                 key_expr = ir.key_expr or "0"
                 val_expr = ir.val_expr or "0"
-                key_csharp = csharp_expr(key_expr)
-                val_csharp = csharp_expr(val_expr)
-                chain += f".ToDictionary({gen.var} => {key_csharp}, {gen.var} => {val_csharp})"
+                key_csharp = _csharp_expr(key_expr)
+                val_csharp = _csharp_expr(val_expr)
+                chain_parts.append(
+                    f".ToDictionary({gen.var} => {key_csharp}, {gen.var} => {val_csharp})"
+                )
 
+        chain = "".join(chain_parts)
         lines.append(f"        return {chain};")
 
     else:
@@ -3,6 +3,122 @@ Go renderer for Polyglot Code Sampler
 """
 
 from ..core import IRComp
+from ..lowering import TILE_SIZE, lower_plan
+
+_GO_TYPES = {
+    "int": "int",
+    "bool": "bool",
+    "list": "[]int",
+    "set": "map[int]struct{}",
+    "dict": "map[int]int",
+}
+
+# Fixed goroutine fan-out; {body} holds the filter and accumulate lines and
+# {align} rounds chunks to whole strides so every worker stays on the range;
+# the rounding can overshoot, so each worker clamps itself to {stop}.
+# Each worker stores its partial result in its own slot of parts, so the
+# partials can be combined in worker (i.e. range) order once all are done.
+_GO_PARALLEL_WORKER_SCAFFOLD = """\
+    numWorkers := runtime.NumCPU()
+    chunkSize := ({stop} - {start}) / numWorkers
+    if chunkSize == 0 {{ chunkSize = 1 }}{align}
+
+    parts := make([]{part_type}, numWorkers)
+    var wg sync.WaitGroup
+
+    for w := 0; w < numWorkers; w++ {{
+        wg.Add(1)
+        go func(workerID int) {{
+            defer wg.Done()
+            start := {start} + workerID * chunkSize
+            if start > {stop} {{ start = {stop} }}
+            end := start + chunkSize
+            if workerID == numWorkers-1 || end > {stop} {{ end = {stop} }}
+
+            acc := {identity}
+            for {var} := start; {var} < end; {var} += {step} {{
+{body}
+            }}
+            parts[workerID] = acc
+        }}(w)
+    }}
+    wg.Wait()
+"""
+
+# Reduction identities, used to seed both sequential and per-worker accumulators
+_GO_REDUCE_IDENTITY = {
+    "sum": "0",
+    "prod": "1",
+    "max": "math.MinInt",
+    "min": "math.MaxInt",
+    "any": "false",
+    "all": "true",
+}
+
+# Reduction loop bodies, keyed by kind; {indent} is the loop body's indentation.
+# Parallel any/all can only stop their own worker, so they break instead of
+# returning.
+_GO_REDUCE_BODY = {
+    "sum": "{indent}acc += {expr}",
+    "prod": "{indent}acc *= {expr}",
+    "max": "{indent}if v := {expr}; v > acc {{ acc = v }}",
+    "min": "{indent}if v := {expr}; v < acc {{ acc = v }}",
+}
+_GO_SEQ_SHORT_CIRCUIT = {
+    "any": "        if {expr} {{ return true }}",
+    "all": "        if !({expr}) {{ return false }}",
+}
+_GO_PAR_SHORT_CIRCUIT = {
+    "any": "                if {expr} {{ acc = true; break }}",
+    "all": "                if !({expr}) {{ acc = false; break }}",
+}
+
+# Folding the per-worker partials into the result, keyed by reduction kind
+_GO_PARALLEL_COMBINE = {
+    "sum": "        acc += part",
+    "prod": "        acc *= part",
+    "max": "        if part > acc { acc = part }",
+    "min": "        if part < acc { acc = part }",
+    "any": "        if part { return true }",
+    "all": "        if !part { return false }",
+}
+
+# Parallel collections: (worker accumulator, worker body, combine body)
+_GO_PARALLEL_COLLECTION = {
+    "list": (
+        "make([]int, 0)",
+        "                acc = append(acc, {value})",
+        "        acc = append(acc, part...)",
+    ),
+    "set": (
+        "make(map[int]struct{{}})",
+        "                acc[{value}] = struct{{}}{{}}",
+        "        for k := range part { acc[k] = struct{}{} }",
+    ),
+    "dict": (
+        "make(map[int]int)",
+        "                acc[{var}] = {value}",
+        "        for k, v := range part { acc[k] = v }",
+    ),
+}
+
+# Sequential collection builders: (result initialiser, loop body), keyed by kind.
+# {cap} is ", <iteration count>" for unfiltered loops, reserving the result
+# up front, and empty otherwise: a filter may keep almost nothing.
+_GO_SEQ_COLLECTION = {
+    "list": (
+        "    result := make([]int, 0{cap})",
+        "        result = append(result, {value})",
+    ),
+    "set": (
+        "    result := make(map[int]struct{{}}{cap})",
+        "        result[{value}] = struct{{}}{{}}",
+    ),
+    "dict": (
+        "    result := make(map[int]int{cap})",
+        "        result[{var}] = {value}",
+    ),
+}
 
 
 def render_go(
@@ -20,33 +136,21 @@ def render_go(
       - Loop-based implementation for performance
     """
 
-    # Determine return type
-    if ir.reduce:
-        k = ir.reduce.kind
-        if k in ("sum", "prod", "max", "min"):
-            return_type = "int"
-        elif k in ("any", "all"):
-            return_type = "bool"
-        else:
-            return_type = "int"
-    else:
-        if ir.kind == "list":
-            return_type = "[]int"
-        elif ir.kind == "set":
-            return_type = "map[int]struct{}"
-        elif ir.kind == "dict":
-            return_type = "map[int]int"
-        else:
-            return_type = "[]int"
+    plan = lower_plan(ir)
+    return_type = _GO_TYPES[plan.result]
 
     # Build the function
     lines = []
 
     # Add imports if needed
+    imports = []
+    if plan.reduce in ("max", "min") and plan.var is not None:
+        imports.append("math")  # MinInt/MaxInt identities
     if parallel:
+        imports += ["runtime", "sync"]
+    if imports:
         lines.append("import (")
-        lines.append('    "runtime"')
-        lines.append('    "sync"')
+        lines.extend(f'    "{name}"' for name in imports)
         lines.append(")")
         lines.append("")
 
@@ -54,192 +158,110 @@ def render_go(
     lines.append(f"func {func_name}() {return_type} {{")
 
     # Handle single generator case (most common)
-    if len(ir.generators) == 1:
-        gen = ir.generators[0]
-        var = gen.var
+    if plan.var is not None:
+        var = plan.var
 
-        # Get range bounds
-        if hasattr(gen.source, "start") and hasattr(gen.source, "stop"):
-            start, stop, step = gen.source.start, gen.source.stop, gen.source.step
-        else:
-            # Fallback for other sources
-            start, stop, step = 0, 1000, 1
+        # Get range bounds, falling back to a fixed span for other sources
+        start, stop, step = plan.bounds or (0, 1000, 1)
 
         if parallel:
             # Parallel implementation with goroutines
-            lines.append("    numWorkers := runtime.NumCPU()")
-            lines.append(f"    chunkSize := ({stop} - {start}) / numWorkers")
-            lines.append("    if chunkSize == 0 { chunkSize = 1 }")
-            lines.append("")
-            lines.append("    results := make(chan int, numWorkers)")
-            lines.append("    var wg sync.WaitGroup")
-            lines.append("")
-            lines.append("    for w := 0; w < numWorkers; w++ {{")
-            lines.append("        wg.Add(1)")
-            lines.append("        go func(workerID int) {{")
-            lines.append("            defer wg.Done()")
-            lines.append(f"            start := {start} + workerID * chunkSize")
-            lines.append("            end := start + chunkSize")
-            lines.append(f"            if workerID == numWorkers-1 {{ end = {stop} }}")
-            lines.append("")
-            lines.append("            acc := 0")
+            body = [
+                f"                if !({filter_expr}) {{ continue }}"
+                for filter_expr in plan.filters
+            ]
+            if plan.reduce:
+                identity = _GO_REDUCE_IDENTITY.get(plan.reduce, "0")
+                op = _GO_PAR_SHORT_CIRCUIT.get(plan.reduce)
+                if op is None:
+                    op = _GO_REDUCE_BODY[plan.reduce].replace("{indent}", " " * 16)
+                body.append(op.format(expr=plan.reduce_expr))
+                combine = _GO_PARALLEL_COMBINE[plan.reduce]
+            else:
+                identity, op, combine = _GO_PARALLEL_COLLECTION[plan.result]
+                identity = identity.format()  # unescape braces
+                body.append(op.format(var=var, value=plan.element or var))
+
+            align = ""
+            if step != 1:
+                align = f"\n    chunkSize = (chunkSize + {step} - 1) / {step} * {step}"
             lines.append(
-                f"            for {var} := start; {var} < end; {var} += {step} {{"
+                _GO_PARALLEL_WORKER_SCAFFOLD.format(
+                    start=start,
+                    stop=stop,
+                    step=step,
+                    var=var,
+                    body="\n".join(body),
+                    align=align,
+                    part_type=return_type,
+                    identity=identity,
+                )
             )
-
-            # Add filters
-            for filter_expr in gen.filters:
-                lines.append(f"                if !({filter_expr}) {{ continue }}")
-
-            # Add the operation
-            if ir.reduce:
-                k = ir.reduce.kind
-                if ir.kind == "dict":
-                    expr = ir.val_expr or "0"
-                else:
-                    expr = ir.element or "0"
-
-                if k == "sum":
-                    lines.append(f"                acc += {expr}")
-                elif k == "max":
-                    lines.append(f"                if {expr} > acc {{ acc = {expr} }}")
-                elif k == "min":
-                    lines.append(f"                if {expr} < acc {{ acc = {expr} }}")
-                elif k == "any":
-                    lines.append(f"                if {expr} {{ acc = 1; break }}")
-                elif k == "all":
-                    lines.append(f"                if !{expr} {{ acc = 0; break }}")
-            else:
-                # Collection operations
-                if ir.kind == "list":
-                    if ir.element:
-                        lines.append(f"                acc += {ir.element}")
-                    else:
-                        lines.append(f"                acc += {var}")
-                elif ir.kind == "set":
-                    lines.append("                acc += 1")  # Count unique elements
-                elif ir.kind == "dict":
-                    if ir.element:
-                        lines.append(f"                acc += {ir.element}")
-                    else:
-                        lines.append(f"                acc += {var}")
-
-            lines.append("            }")
-            lines.append("            results <- acc")
-            lines.append("        }(w)")
+            # any/all return from inside the combine loop once decided
+            if plan.reduce not in _GO_PAR_SHORT_CIRCUIT:
+                lines.append(f"    acc := {identity}")
+            lines.append("    for _, part := range parts {")
+            lines.append(combine)
             lines.append("    }")
-            lines.append("")
-            lines.append("    wg.Wait()")
-            lines.append("    close(results)")
-            lines.append("")
-
-            if ir.reduce:
-                if ir.reduce.kind in ("any", "all"):
-                    lines.append("    for result := range results {")
-                    lines.append("        if result == 1 { return true }")
-                    lines.append("    }")
-                    lines.append("    return false")
-                else:
-                    lines.append("    total := 0")
-                    lines.append("    for result := range results {")
-                    lines.append("        total += result")
-                    lines.append("    }")
-                    lines.append("    return total")
+            if plan.reduce == "any":
+                lines.append("    return false")
+            elif plan.reduce == "all":
+                lines.append("    return true")
             else:
-                lines.append("    result := make([]int, 0)")
-                lines.append("    for result := range results {")
-                lines.append("        result = append(result, result)")
-                lines.append("    }")
-                lines.append("    return result")
+                lines.append("    return acc")
         else:
-            # Sequential implementation
-            if ir.reduce:
+            # Sequential implementation: one template per IR shape
+            loop = [f"    for {var} := {start}; {var} < {stop}; {var} += {step} {{"]
+            loop.extend(
+                f"        if !({filter_expr}) {{ continue }}"
+                for filter_expr in plan.filters
+            )
+
+            if plan.tiled():
+                # Strip-mined sum: one accumulator per cache-sized tile
                 lines.append("    acc := 0")
                 lines.append(
-                    f"    for {var} := {start}; {var} < {stop}; {var} += {step} {{"
+                    f"    for base := {start}; base < {stop}; base += {TILE_SIZE} {{"
                 )
-
-                # Add filters
-                for filter_expr in gen.filters:
-                    lines.append(f"        if !({filter_expr}) {{ continue }}")
-
-                # Add the operation
-                k = ir.reduce.kind
-                if ir.kind == "dict":
-                    expr = ir.val_expr or "0"
-                else:
-                    expr = ir.element or "0"
-
-                if k == "sum":
-                    lines.append(f"        acc += {expr}")
-                elif k == "max":
-                    lines.append(f"        if {expr} > acc {{ acc = {expr} }}")
-                elif k == "min":
-                    lines.append(f"        if {expr} < acc {{ acc = {expr} }}")
-                elif k == "any":
-                    lines.append(f"        if {expr} {{ return true }}")
-                elif k == "all":
-                    lines.append(f"        if !{expr} {{ return false }}")
-
+                lines.append(f"        end := base + {TILE_SIZE}")
+                lines.append(f"        if end > {stop} {{ end = {stop} }}")
+                lines.append("        tileAcc := 0")
+                lines.append(f"        for {var} := base; {var} < end; {var}++ {{")
+                for filter_expr in plan.filters:
+                    lines.append(f"            if !({filter_expr}) {{ continue }}")
+                lines.append(f"            tileAcc += {plan.reduce_expr}")
+                lines.append("        }")
+                lines.append("        acc += tileAcc")
                 lines.append("    }")
-
-                if k in ("any", "all"):
-                    lines.append("    return false")
-                else:
-                    lines.append("    return acc")
-            else:
-                # Collection operations
-                if ir.kind == "list":
-                    lines.append("    result := make([]int, 0)")
-                    lines.append(
-                        f"    for {var} := {start}; {var} < {stop}; {var} += {step} {{"
-                    )
-
-                    # Add filters
-                    for filter_expr in gen.filters:
-                        lines.append(f"        if !({filter_expr}) {{ continue }}")
-
-                    if ir.element:
-                        lines.append(f"        result = append(result, {ir.element})")
-                    else:
-                        lines.append(f"        result = append(result, {var})")
-
-                    lines.append("    }")
-                    lines.append("    return result")
-                elif ir.kind == "set":
-                    lines.append("    result := make(map[int]struct{})")
-                    lines.append(
-                        f"    for {var} := {start}; {var} < {stop}; {var} += {step} {{"
-                    )
-
-                    # Add filters
-                    for filter_expr in gen.filters:
-                        lines.append(f"        if !({filter_expr}) {{ continue }}")
-
-                    if ir.element:
-                        lines.append(f"        result[{ir.element}] = struct{{}}{{}}")
-                    else:
-                        lines.append(f"        result[{var}] = struct{{}}{{}}")
-
-                    lines.append("    }")
-                    lines.append("    return result")
-                elif ir.kind == "dict":
-                    lines.append("    result := make(map[int]int)")
-                    lines.append(
-                        f"    for {var} := {start}; {var} < {stop}; {var} += {step} {{"
-                    )
-
-                    # Add filters
-                    for filter_expr in gen.filters:
-                        lines.append(f"        if !({filter_expr}) {{ continue }}")
-
-                    if ir.element:
-                        lines.append(f"        result[{var}] = {ir.element}")
-                    else:
-                        lines.append(f"        result[{var}] = {var}")
-
-                    lines.append("    }")
-                    lines.append("    return result")
+                lines.append("    return acc")
+            elif plan.reduce in _GO_SEQ_SHORT_CIRCUIT:
+                # any/all return as soon as the answer is known
+                lines.extend(loop)
+                body = _GO_SEQ_SHORT_CIRCUIT[plan.reduce]
+                lines.append(body.format(expr=plan.reduce_expr))
+                lines.append("    }")
+                lines.append(
+                    "    return false" if plan.reduce == "any" else "    return true"
+                )
+            elif plan.reduce:
+                identity = _GO_REDUCE_IDENTITY.get(plan.reduce, "0")
+                lines.append(f"    acc := {identity}")
+                lines.extend(loop)
+                body = _GO_REDUCE_BODY.get(plan.reduce)
+                if body:
+                    lines.append(body.format(indent=" " * 8, expr=plan.reduce_expr))
+                lines.append("    }")
+                lines.append("    return acc")
+            elif plan.kind in _GO_SEQ_COLLECTION:
+                init, body = _GO_SEQ_COLLECTION[plan.kind]
+                cap = ""
+                if not plan.filters:
+                    cap = f", {len(range(start, stop, step))}"
+                lines.append(init.format(cap=cap))
+                lines.extend(loop)
+                lines.append(body.format(var=var, value=plan.element or var))
+                lines.append("    }")
+                lines.append("    return result")
     else:
         # Multiple generators - fallback to sequential
         lines.append("    // Multiple generators - using sequential implementation")
@@ -2,7 +2,110 @@
 Rust renderer for Polyglot Code Sampler
 """
 
+from __future__ import annotations
+
+import ast
+
 from ..core import IRComp
+from ..lowering import TILE_SIZE, LoweredPlan, lower_plan
+
+# Return types by result shape; {t} is the configured integer type
+_RUST_TYPES = {
+    "int": "{t}",
+    "bool": "bool",
+    "list": "Vec<{t}>",
+    "set": "FxHashSet<{t}>",
+    "dict": "FxHashMap<{t}, {t}>",
+}
+
+# Rayon chunks at least this long keep each chunk's inner loop vectorizable;
+# only requested when the range still splits into two or more such chunks
+_RAYON_MIN_LEN = 65536
+
+# Iterator chain endings, keyed by reduction kind
+_RUST_REDUCE_TAIL = {
+    "sum": ".map(|{var}| {expr}).sum()",
+    "max": ".map(|{var}| {expr}).max().unwrap_or(0)",
+    "min": ".map(|{var}| {expr}).min().unwrap_or(0)",
+    "any": ".any(|{var}| {expr})",
+    "all": ".all(|{var}| {expr})",
+}
+
+# Narrowest signed type first, by largest magnitude it holds
+_RUST_INT_WIDTHS = (("i16", 2**15 - 1), ("i32", 2**31 - 1))
+
+
+def _magnitude(node: ast.AST, var: str, var_max: int) -> int | None:
+    """Upper bound on |value| of an expression node, or None if unknown"""
+    if isinstance(node, ast.Name) and node.id == var:
+        return var_max
+    if isinstance(node, ast.Constant) and type(node.value) is int:
+        return abs(node.value)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        return _magnitude(node.operand, var, var_max)
+    if isinstance(node, ast.BinOp):
+        left = _magnitude(node.left, var, var_max)
+        right = _magnitude(node.right, var, var_max)
+        if left is None or right is None:
+            return None
+        if isinstance(node.op, (ast.Add, ast.Sub)):
+            return left + right
+        if isinstance(node.op, ast.Mult):
+            return left * right
+        if isinstance(node.op, ast.FloorDiv):
+            return left
+        if isinstance(node.op, ast.Mod):
+            return min(left, right)
+        exponent = node.right
+        if (
+            isinstance(node.op, ast.Pow)
+            and isinstance(exponent, ast.Constant)
+            and type(exponent.value) is int
+            and exponent.value >= 0
+        ):
+            return left ** exponent.value
+    return None
+
+
+def _infer_int_type(plan: LoweredPlan) -> str:
+    """Narrowest integer type that holds every value the program produces
+
+    Falls back to i64 whenever the bound cannot be derived, e.g. for
+    products, nested generators or expressions with calls and indexing.
+    """
+    if plan.bounds is None or plan.reduce == "prod":
+        return "i64"
+    start, stop, step = plan.bounds
+    values = range(start, stop, step)
+    var_max = max(abs(values[0]), abs(values[-1])) if values else 0
+
+    if plan.result == "bool":
+        exprs = []  # any/all only test their predicate
+    elif plan.reduce:
+        exprs = [plan.reduce_expr]
+    elif plan.kind == "dict":
+        exprs = [plan.key_expr or "0", plan.val_expr or "0"]
+    else:
+        exprs = [plan.element or plan.var]
+    try:
+        bounds = [
+            _magnitude(ast.parse(expr, mode="eval").body, plan.var, var_max)
+            for expr in exprs
+        ]
+    except SyntaxError:
+        return "i64"
+    if None in bounds:
+        return "i64"
+    # The range values are typed int_type too (literal suffixes on the counted
+    # loop's bounds, inference from the result in iterator chains)
+    largest = max(bounds + [var_max])
+    if plan.reduce == "sum":
+        largest = max(largest, len(values) * max(bounds))
+
+    for name, limit in _RUST_INT_WIDTHS:
+        if largest <= limit:
+            return name
+    return "i64"
 
 
 def render_rust(
@@ -14,101 +117,137 @@ def render_rust(
     """
     Rust backend with Rayon parallel support:
       list -> Vec<i32>
-      set  -> HashSet<i32>
-      dict -> HashMap<i32, i32>
+      set  -> FxHashSet<i32>
+      dict -> FxHashMap<i32, i32>
       reductions: sum/max/min -> i32, any/all -> bool
+    int_type="auto" picks the narrowest of i16/i32/i64 that cannot overflow
+    for the range bounds and body, so more lanes fit each SIMD register.
     Notes:
       - Uses Rayon for parallel processing
       - Type-safe with compile-time guarantees
       - Iterator chains for functional style
+      - FxHash instead of SipHash for the small integer keys; hashed
+        results over a range are pre-sized to the range length
     """
 
-    # Determine return type
-    if ir.reduce:
-        k = ir.reduce.kind
-        if k in ("sum", "prod", "max", "min"):
-            return_type = int_type
-        elif k in ("any", "all"):
-            return_type = "bool"
-        else:
-            return_type = int_type
-    else:
-        if ir.kind == "list":
-            return_type = f"Vec<{int_type}>"
-        elif ir.kind == "set":
-            return_type = f"HashSet<{int_type}>"
-        elif ir.kind == "dict":
-            return_type = f"HashMap<{int_type}, {int_type}>"
-        else:
-            return_type = f"Vec<{int_type}>"
+    plan = lower_plan(ir)
+    if int_type == "auto":
+        int_type = _infer_int_type(plan)
+    return_type = _RUST_TYPES[plan.result].format(t=int_type)
 
     # Build the iterator chain
     lines = []
 
-    # Add imports
-    lines.append("use std::collections::{HashMap, HashSet};")
+    # Add imports; only hashed results need a crate beyond std
+    if plan.result in ("set", "dict"):
+        lines.append(f"use rustc_hash::{return_type.split('<', 1)[0]};")
     if parallel:
         lines.append("use rayon::prelude::*;")
-    lines.append("")
+    if lines:
+        lines.append("")
+
+    # Unfiltered sequential sums over a unit-step range become a plain counted
+    # loop, which LLVM vectorizes far more reliably than a map/sum closure chain
+    tiled = not parallel and plan.tiled()
+    sum_kernel = (
+        not tiled
+        and plan.reduce == "sum"
+        and not parallel
+        and not plan.filters
+        and plan.var is not None
+        and plan.bounds is not None
+        and plan.bounds[2] == 1
+    )
 
     # Function signature
+    if sum_kernel:
+        lines.append("/// Compile with `-C target-cpu=native` for wider SIMD.")
+        lines.append("#[inline(always)]")
     lines.append(f"pub fn {func_name}() -> {return_type} {{")
 
     # Build the source range
-    if len(ir.generators) == 1 and hasattr(ir.generators[0].source, "start"):
-        gen = ir.generators[0]
-        start, stop, step = gen.source.start, gen.source.stop, gen.source.step
+    if sum_kernel:
+        start, stop, _ = plan.bounds
+        # Typed bounds make the loop variable, and so the body's arithmetic,
+        # {int_type}; overflow still traps in debug builds like .sum() does
+        lines.append(f"    let mut acc: {int_type} = 0;")
+        lines.append(
+            f"    for {plan.var} in {start}{int_type}..{stop}{int_type} {{"
+        )
+        lines.append(f"        acc += {plan.reduce_expr};")
+        lines.append("    }")
+        lines.append("    acc")
 
-        if step == 1:
-            source = f"({start}..{stop})"
-        else:
-            source = f"({start}..{stop}).step_by({step})"
+    elif plan.var is not None and plan.bounds is not None:
+        var = plan.var
+        start, stop, step = plan.bounds
 
-        # Add parallel prefix if requested
+        source = f"({start}..{stop})"
+
+        # Add parallel prefix if requested; Rayon strides its own iterator,
+        # since std's StepBy cannot be turned into a parallel one
         if parallel:
             source = f"{source}.into_par_iter()"
+        if step != 1:
+            source = f"{source}.step_by({step})"
+        if parallel:
+            n = len(range(start, stop, step))
+            if plan.reduce == "sum" and n >= 2 * _RAYON_MIN_LEN:
+                source = f"{source}.with_min_len({_RAYON_MIN_LEN})"
+
+        # Build the iterator chain from parts, joined once below
+        chain_parts = [source]
 
-        # Build the iterator chain
-        chain = source
+        if tiled:
+            # Strip-mine into TILE_SIZE blocks, each summed on its own
+            chain_parts[0] = f"{source}.step_by({TILE_SIZE})"
+            chain_parts.append(f".map(|base| (base..(base + {TILE_SIZE}).min({stop}))")
 
         # Add filters
-        for filter_expr in gen.filters:
-            chain += f".filter(|&{gen.var}| {filter_expr})"
+        for filter_expr in plan.filters:
+            chain_parts.append(f".filter(|&{var}| {filter_expr})")
+
+        # Unfiltered hashed results are filled into a table sized for every
+        # iteration, skipping the rehash/realloc chain .collect() grows through.
+        # A filter may keep almost nothing, so those still grow on demand.
+        presize = plan.kind in ("set", "dict") and not plan.reduce and not plan.filters
+        container = return_type.split("<", 1)[0]
 
         # Add the final operation
-        if ir.reduce:
-            k = ir.reduce.kind
-            if ir.kind == "dict":
-                expr = ir.val_expr or "0"
-            else:
-                expr = ir.element or "0"
-
-            if k == "sum":
-                chain += f".map(|{gen.var}| {expr}).sum()"
-            elif k == "max":
-                chain += f".map(|{gen.var}| {expr}).max().unwrap_or(0)"
-            elif k == "min":
-                chain += f".map(|{gen.var}| {expr}).min().unwrap_or(0)"
-            elif k == "any":
-                chain += f".any(|{gen.var}| {expr})"
-            elif k == "all":
-                chain += f".all(|{gen.var}| {expr})"
+        if plan.reduce:
+            tail = _RUST_REDUCE_TAIL.get(plan.reduce)
+            if tiled:
+                chain_parts.append(
+                    f".map(|{var}| {plan.reduce_expr}).sum::<{int_type}>()).sum()"
+                )
+            elif tail:
+                chain_parts.append(tail.format(var=var, expr=plan.reduce_expr))
         else:
             # Collection operations
-            if ir.kind == "list":
-                if ir.element:
-                    chain += f".map(|{gen.var}| {ir.element})"
-                chain += ".collect()"
-            elif ir.kind == "set":
-                if ir.element:
-                    chain += f".map(|{gen.var}| {ir.element})"
-                chain += ".collect()"
-            elif ir.kind == "dict":
-                key_expr = ir.key_expr or "0"
-                val_expr = ir.val_expr or "0"
-                chain += f".map(|{gen.var}| ({key_expr}, {val_expr})).collect()"
-
-        lines.append(f"    {chain}")
+            if plan.kind in ("list", "set"):
+                if plan.element:
+                    chain_parts.append(f".map(|{var}| {plan.element})")
+                if not presize:
+                    chain_parts.append(".collect()")
+            elif plan.kind == "dict":
+                key_expr = plan.key_expr or "0"
+                val_expr = plan.val_expr or "0"
+                chain_parts.append(f".map(|{var}| ({key_expr}, {val_expr}))")
+                if not presize:
+                    chain_parts.append(".collect()")
+
+        chain = "".join(chain_parts)
+        if presize:
+            capacity = len(range(start, stop, step))
+            extend = "par_extend" if parallel else "extend"
+            lines.append(
+                f"    let mut result = {container}::with_capacity_and_hasher("
+                f"{capacity}, Default::default());"
+            )
+            lines.append(f"    result.{extend}({chain});")
+            lines.append("    result")
+        else:
+            lines.append(f"    {chain}")
 
     else:
         # Handle nested comprehensions (more complex)
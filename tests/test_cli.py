@@ -0,0 +1,38 @@
+"""
+Tests for the pcs command-line helpers
+"""
+
+from pcs.cli import execute_sql_and_display
+from pcs.core import PyToIR
+from pcs.renderer_api import render
+
+
+def test_execute_sql_matches_sqlite_shell_output(capsys):
+    ir = PyToIR().parse("{x: x*x for x in range(3)}")
+    execute_sql_and_display(render("sql", ir))
+
+    assert capsys.readouterr().out == "SQL Results:\n0|0\n1|1\n2|4\n\n"
+
+
+def test_execute_sql_reports_errors(capsys):
+    execute_sql_and_display("SELECT * FROM missing_table")
+
+    assert capsys.readouterr().out.startswith("SQL Error:")
+
+
+def test_execute_sql_keeps_rows_before_a_failing_statement(capsys):
+    execute_sql_and_display("SELECT 1;\nSELECT * FROM missing_table;")
+
+    out = capsys.readouterr().out
+    assert out.startswith("SQL Results:\n1\n\n")
+    assert "SQL Error: no such table: missing_table" in out
+
+
+def test_execute_sql_times_out(capsys, monkeypatch):
+    monkeypatch.setattr("pcs.cli._SQL_TIMEOUT_S", 0.2)
+    execute_sql_and_display(
+        "WITH RECURSIVE r(x) AS (SELECT 0 UNION ALL SELECT x + 1 FROM r)"
+        " SELECT count(*) FROM r;"
+    )
+
+    assert capsys.readouterr().out == "SQL execution timed out\n"
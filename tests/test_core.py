@@ -0,0 +1,51 @@
+"""
+Tests for the Python → IR front end
+"""
+
+import json
+
+import pytest
+
+from pcs import core
+from pcs.core import PyToIR
+
+
+def test_to_json_matches_stdlib_layout():
+    ir = PyToIR().parse("{i: i*i for i in range(1, 6) if i % 2 == 1}")
+    out = ir.to_json()
+
+    data = json.loads(out)
+    assert data["__type__"] == "IRComp"
+    assert data["generators"][0]["source"] == {"start": 1, "stop": 6, "step": 1}
+    assert out == json.dumps(data, indent=2)
+
+
+@pytest.mark.parametrize("pretty", [True, False])
+def test_to_json_is_identical_with_and_without_orjson(monkeypatch, pretty):
+    pytest.importorskip("orjson")
+    ir = PyToIR().parse("[x for x in range(3) if x != 1]")
+    ir.provenance = {"note": "café ✓"}
+    with_orjson = ir.to_json(pretty=pretty)
+    monkeypatch.setattr(core, "orjson", None)
+    assert ir.to_json(pretty=pretty) == with_orjson
+
+
+def test_to_json_handles_unbounded_ints():
+    ir = PyToIR().parse(f"[x for x in range({10**30})]")
+    assert json.loads(ir.to_json())["generators"][0]["source"]["stop"] == 10**30
+
+
+def test_negative_range_bounds():
+    source = PyToIR().parse("[x for x in range(-5, 5, -1)]").generators[0].source
+    assert (source.start, source.stop, source.step) == (-5, 5, -1)
+
+
+def test_has_filters_is_derived_from_generators():
+    parser = PyToIR()
+    assert parser.parse("[x for x in range(3) if x]").has_filters
+    ir = parser.parse("sum(x for x in range(3))")
+    assert not ir.has_filters
+
+    ir.generators[0].filters.append("x > 2")
+    assert ir.has_filters
+    assert "has_filters" not in ir.to_json()
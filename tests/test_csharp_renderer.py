@@ -0,0 +1,50 @@
+"""
+Unit tests for the C# LINQ renderer
+"""
+
+from pcs.core import PyToIR
+from pcs.renderers.csharp import render_csharp
+
+
+def _render(code: str, **kwargs) -> str:
+    return render_csharp(PyToIR().parse(code), **kwargs)
+
+
+def test_python_operators_are_translated():
+    out = _render("[x ** 2 for x in range(10) if x > 1 and not x == 4 or False]")
+    assert ".Where(x => x > 1 && ! x == 4 || false)" in out
+    assert ".Select(x => Math.Pow(x, 2))" in out
+
+
+def test_keywords_inside_identifiers_are_kept():
+    out = _render("[x * order for x in range(100)]")
+    assert ".Select(x => x * order)" in out
+
+
+def test_plinq_only_for_large_ranges():
+    small = _render("sum(x for x in range(100))", parallel=True)
+    assert "AsParallel" not in small
+    # Gated on the element count, not the span: this is 1000 elements
+    sparse = _render("sum(x for x in range(0, 1000000, 1000))", parallel=True)
+    assert "AsParallel" not in sparse
+
+    large = _render("sum(x for x in range(100000))", parallel=True)
+    assert (
+        "Enumerable.Range(0, 100000).AsParallel()"
+        ".WithDegreeOfParallelism(Environment.ProcessorCount).Sum(x => x)"
+    ) in large
+
+
+def test_known_size_lists_return_arrays():
+    small = _render("[x * 2 for x in range(1, 10, 2)]")
+    assert "public static int[] Execute()" in small
+    assert "var _result = new int[5];" in small
+    assert "int x = 1 + _i * 2;" in small
+    assert "Enumerable" not in small.split("Execute()")[1]
+
+    large = _render("[x * 2 for x in range(1000)]")
+    assert "Select(x => x * 2).ToArray()" in large
+
+    filtered = _render("[x for x in range(10) if x > 2]")
+    assert "public static List<int> Execute()" in filtered
+    assert filtered.rstrip().endswith("}") and ".ToList()" in filtered
@@ -0,0 +1,114 @@
+"""
+Unit tests for the Go goroutine renderer
+"""
+
+import shutil
+import subprocess
+
+import pytest
+
+from pcs.core import PyToIR
+from pcs.renderers.go import render_go
+
+
+def _render(code: str, **kwargs) -> str:
+    return render_go(PyToIR().parse(code), **kwargs)
+
+
+def test_array_indexing_sum_is_tiled():
+    out = _render("sum(a[x] for x in range(100000) if x > 2)")
+    assert "for base := 0; base < 100000; base += 4096 {" in out
+    assert "if end > 100000 { end = 100000 }" in out
+    assert "            if !(x > 2) { continue }" in out
+    assert "        acc += tileAcc" in out
+
+
+def test_parallel_output_has_no_escaped_braces():
+    out = _render("sum(x for x in range(100000))", parallel=True)
+    assert "{{" not in out
+    assert "go func(workerID int) {" in out
+
+
+def test_collections_are_presized_from_range_bounds():
+    assert "result := make([]int, 0, 5)" in _render("[x for x in range(0, 10, 2)]")
+    out = _render("{x for x in range(1, 11)}")
+    assert "result := make(map[int]struct{}, 10)" in out
+    assert "result := make(map[int]int, 3)" in _render("{x: x for x in range(3)}")
+    # A filter may keep almost nothing, so don't reserve the whole range
+    out = _render("[x for x in range(1000000000) if x == 5]")
+    assert "result := make([]int, 0)" in out
+
+
+def test_parallel_chunks_are_aligned_to_fused_stride():
+    out = _render("sum(x for x in range(100000) if x % 4 == 1)", parallel=True)
+    assert "chunkSize = (chunkSize + 4 - 1) / 4 * 4" in out
+    assert "for x := start; x < end; x += 4 {" in out
+    assert "continue" not in out
+
+
+_WORKER_COUNTS = (1, 3, 16, 32, 64, 200)
+
+needs_go = pytest.mark.skipif(shutil.which("go") is None, reason="go not installed")
+
+
+def _go_outputs(tmp_path, code: str, parallel: bool) -> list:
+    """Run the rendered program once per pinned worker count, one line each"""
+    src = _render(code, parallel=parallel)
+    func = src[src.index("func ") :].replace("runtime.NumCPU()", "workers")
+    imports = ["fmt"] + [pkg for pkg in ("math", "sync") if f"{pkg}." in func]
+    counts = _WORKER_COUNTS if parallel else (1,)
+    main = tmp_path / "main.go"
+    main.write_text(
+        "package main\n\nimport (\n"
+        + "".join(f'    "{pkg}"\n' for pkg in imports)
+        + ")\n\nvar workers int\n\n"
+        + func
+        + "\nfunc main() {\n"
+        f"    for _, n := range []int{{{', '.join(map(str, counts))}}} {{\n"
+        "        workers = n\n"
+        "        fmt.Println(program())\n"
+        "    }\n"
+        "}\n"
+    )
+    out = subprocess.run(
+        ["go", "run", str(main)], capture_output=True, text=True, check=True
+    ).stdout
+    return out.splitlines()
+
+
+@needs_go
+def test_parallel_result_is_independent_of_worker_count(tmp_path):
+    code = "sum(x for x in range(0, 100) if x % 7 == 0)"
+    assert _go_outputs(tmp_path, code, parallel=True) == ["735"] * 6
+
+
+@needs_go
+@pytest.mark.parametrize(
+    "code, expected",
+    [
+        (
+            "[i * i for i in range(20) if i % 2 == 0]",
+            "[0 4 16 36 64 100 144 196 256 324]",
+        ),
+        ("max(x - 500 for x in range(100))", "-401"),
+        ("min(x + 5 for x in range(3, 100))", "8"),
+        ("any(x > 98 for x in range(100))", "true"),
+        ("all(x >= 0 for x in range(100))", "true"),
+        ("all(x < 99 for x in range(100))", "false"),
+    ],
+)
+def test_parallel_programs_run_correctly(tmp_path, code, expected):
+    assert _go_outputs(tmp_path, code, parallel=True) == [expected] * 6
+
+
+@needs_go
+@pytest.mark.parametrize(
+    "code, expected",
+    [
+        ("max(x - 500 for x in range(100))", "-401"),
+        ("all(x >= 0 for x in range(100))", "true"),
+        ("any(x > 200 for x in range(100))", "false"),
+    ],
+)
+def test_sequential_reductions_run_correctly(tmp_path, code, expected):
+    assert _go_outputs(tmp_path, code, parallel=False) == [expected]
@@ -0,0 +1,153 @@
+"""
+Unit tests for the Julia backend (strategy selection and emission)
+"""
+
+import io
+
+from pcs.backends.julia import lower_program
+from pcs.backends.julia.lower import _should_use_broadcast
+from pcs.backends.julia.strategy import choose_strategy, size_hint
+from pcs.core import PyToIR
+
+
+def _choose(code: str, **overrides):
+    ir = PyToIR().parse(code)
+    kwargs = {
+        "user_mode": "auto",
+        "elem_count_hint": size_hint(ir),
+        "op_kind": ir.reduce.kind if ir.reduce else None,
+        "elem_type": "Int",
+        "parallel_requested": True,
+        "explain": True,
+    }
+    kwargs.update(overrides)
+    return choose_strategy(ir, **kwargs)
+
+
+def test_identifier_containing_keyword_is_not_a_dependency():
+    """Names like `factor` must not trip the `or` control-flow check"""
+    _, flavor, explanation, _ = _choose("sum(x * factor for x in range(100000))")
+    assert flavor == "threadlocals"
+    assert "cross-iteration" not in explanation
+
+
+def test_conditional_expression_blocks_parallel():
+    _, flavor, explanation, _ = _choose("sum(x if x > 5 else 0 for x in range(100000))")
+    assert flavor == "sequential"
+    assert "cross-iteration dependencies detected" in explanation
+
+
+def test_boolean_filter_blocks_parallel():
+    _, flavor, _, _ = _choose("sum(x for x in range(100000) if x > 5 and x < 90)")
+    assert flavor == "sequential"
+
+
+def test_small_n_falls_back_to_sequential():
+    _, flavor, explanation, _ = _choose("sum(x * x for x in range(100))")
+    assert flavor == "sequential"
+    assert "N=100 too small" in explanation
+
+    _, flavor, _, _ = _choose("sum(x * x for x in range(100))", elem_count_hint=None)
+    assert flavor == "threadlocals"
+
+
+def test_broadcast_check_matches_whole_keywords_only():
+    ir = PyToIR().parse("[x * stiff for x in range(10)]")
+    assert _should_use_broadcast(ir, ir.generators[0])
+
+    ir = PyToIR().parse("[x if x else 0 for x in range(10)]")
+    assert not _should_use_broadcast(ir, ir.generators[0])
+
+
+def test_deep_fusion_prefers_loops_for_small_n():
+    mode, _, explanation, _ = _choose(
+        "[x * x + x * 2 - x / 3 for x in range(100)]", parallel_requested=False
+    )
+    assert mode == "loops"
+    assert "broadcast fusion depth=5" in explanation
+
+    mode, _, _, _ = _choose("[x * x + 1 for x in range(100)]", parallel_requested=False)
+    assert mode == "broadcast"
+
+
+def test_missing_element_gets_its_own_loops_note():
+    ir = PyToIR().parse("[x for x in range(100)]")
+    ir.element = None
+    mode, _, explanation, _ = choose_strategy(
+        ir,
+        user_mode="auto",
+        elem_count_hint=100,
+        op_kind=None,
+        parallel_requested=False,
+    )
+    assert mode == "loops"
+    assert "no element expression to broadcast" in explanation
+    assert "None" not in explanation
+
+
+def test_no_explain_keeps_decision_and_drops_notes():
+    code = "sum(x for x in range(100))"
+    explained = _choose(code)
+    quiet = _choose(code, explain=False)
+    assert explained[2]
+    assert quiet[2] == ""
+    assert quiet[:2] + quiet[3:] == explained[:2] + explained[3:]
+
+
+def test_array_indexing_sum_is_tiled():
+    ir = PyToIR().parse("sum(a[x] * 2 for x in range(100000))")
+    out = lower_program(ir)
+    assert ":4096:99999" in out
+    assert "@simd for x in tile" in out
+
+
+def test_numeric_reduction_loops_are_simd_annotated():
+    ir = PyToIR().parse("sum(x * x for x in range(100000))")
+    assert "@simd for x in 0:99999" in lower_program(ir, mode="loops")
+    out = lower_program(ir, mode="loops", unsafe=True)
+    assert "@fastmath @inbounds @simd for x in 0:99999" in out
+
+    filtered = PyToIR().parse("sum(x for x in range(100000) if x > 2)")
+    assert "@simd" not in lower_program(filtered, mode="loops")
+
+
+def test_parallel_reduction_uses_task_local_accumulator():
+    _, flavor, _, accumulator = _choose("sum(x * x for x in range(100000))")
+    assert (flavor, accumulator) == ("threadlocals", "reduction_closure")
+
+    _, flavor, _, accumulator = _choose("{x: x for x in range(100000)}")
+    assert (flavor, accumulator) == ("sharded", "thread_local_array")
+
+    ir = PyToIR().parse("sum(x * x for x in range(100000))")
+    out = lower_program(ir, parallel=True)
+    assert "[threadid()]" not in out
+    assert "parts1[t" in out
+    # The combine loop only carries a macro under unsafe, never a bare space
+    assert "\n        for p in parts1\n" in out
+    assert "@inbounds for p in parts1" in lower_program(ir, parallel=True, unsafe=True)
+
+
+def test_lower_program_streams_to_out():
+    ir = PyToIR().parse("sum(i*i for i in range(1, 10) if i%2==0)")
+    rendered = lower_program(ir)
+
+    out = io.StringIO()
+    assert lower_program(ir, out=out) == ""
+    assert out.getvalue() == rendered + "\n"
+
+
+def test_broadcast_reductions_use_matching_reducer():
+    ir = PyToIR().parse("max(x * x for x in range(10))")
+    out = lower_program(ir, mode="broadcast")
+    assert "maximum(x * x)" in out
+    filtered = PyToIR().parse("min(x for x in range(10) if x > 2)")
+    assert "minimum(ifelse.(x > 2, x, typemax(Int)))" in lower_program(
+        filtered, mode="broadcast"
+    )
+
+
+def test_modulo_filters_fuse_into_julia_range_stride():
+    ir = PyToIR().parse("sum(x * x for x in range(1, 100) if x % 2 == 0)")
+    out = lower_program(ir, mode="loops")
+    assert "for x in 2:2:99" in out
+    assert "% 2" not in out
@@ -0,0 +1,59 @@
+"""
+Tests for the backend-neutral lowering plan
+"""
+
+from pcs.core import PyToIR
+from pcs.lowering import lower_plan
+
+
+def test_plan_for_filtered_reduction():
+    plan = lower_plan(PyToIR().parse("sum(x * x for x in range(2, 10, 2) if x > 3)"))
+    assert plan.result == "int"
+    assert plan.reduce == "sum"
+    assert plan.var == "x"
+    assert plan.bounds == (2, 10, 2)
+    assert plan.filters == ("x > 3",)
+    assert plan.reduce_expr == "x * x"
+
+
+def test_plan_result_shapes():
+    parser = PyToIR()
+    assert lower_plan(parser.parse("any(x > 3 for x in range(5))")).result == "bool"
+    assert lower_plan(parser.parse("{x: x for x in range(5)}")).result == "dict"
+    assert lower_plan(parser.parse("(x for x in range(5))")).result == "list"
+
+
+def test_plan_without_single_generator():
+    plan = lower_plan(PyToIR().parse("[x * y for x in range(3) for y in range(3)]"))
+    assert plan.var is None
+    assert plan.bounds is None
+    assert plan.filters == ()
+
+
+def test_tiling_only_for_large_array_indexing_sums():
+    parser = PyToIR()
+    assert lower_plan(parser.parse("sum(a[x] for x in range(100000))")).tiled()
+    assert not lower_plan(parser.parse("sum(a[x] for x in range(100))")).tiled()
+    assert not lower_plan(parser.parse("sum(x for x in range(100000))")).tiled()
+    assert not lower_plan(parser.parse("max(a[x] for x in range(100000))")).tiled()
+
+
+def test_modulo_filters_fuse_into_range_stride():
+    parser = PyToIR()
+    plan = lower_plan(parser.parse("[x for x in range(1, 20) if x % 3 == 2]"))
+    assert plan.bounds == (2, 20, 3)
+    assert plan.filters == ()
+
+    code = "sum(x for x in range(1, 30, 2) if x % 4 == 3 if x > 5)"
+    plan = lower_plan(parser.parse(code))
+    assert plan.bounds == (3, 30, 4)
+    assert plan.filters == ("x > 5",)
+
+    # No value can match, so the range is emptied rather than filtered
+    plan = lower_plan(parser.parse("[x for x in range(0, 10, 2) if x % 2 == 1]"))
+    assert len(range(*plan.bounds)) == 0
+
+    # Negative values keep the filter: % rounds differently in the targets
+    plan = lower_plan(parser.parse("[x for x in range(-4, 4) if x % 2 == 0]"))
+    assert plan.bounds == (-4, 4, 1)
+    assert plan.filters == ("x % 2 == 0",)
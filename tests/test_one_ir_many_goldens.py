@@ -13,7 +13,7 @@ def test_strategy_selection():
     """Test that strategy selector chooses correct mode for different flags"""
 
     # Test case: sum of even squares
-    python_code = "sum(i*i for i in range(1, 10) if i%2==0)"
+    python_code = "sum(i*i for i in range(1, 100_000) if i%2==0)"
 
     test_cases = [
         {
@@ -76,7 +76,7 @@ def test_strategy_selection():
 def test_dict_comprehension_strategies():
     """Test dict comprehension strategy selection"""
 
-    python_code = "{x: x*x for x in range(1, 10) if x%2==0}"
+    python_code = "{x: x*x for x in range(1, 100_000) if x%2==0}"
 
     test_cases = [
         {
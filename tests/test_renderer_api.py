@@ -115,3 +115,43 @@ class TestRendererAPI:
         for backend in ["rust", "ts", "go"]:
             output = render(backend, sum_ir)
             assert len(output) > 0, f"{backend} should handle reduction IR"
+
+    def test_shims_match_render(self):
+        """Per-backend shims filter kwargs and produce the same output as render()."""
+        from pcs import renderer_api
+
+        for backend in ["rust", "ts", "go", "csharp", "julia", "sql"]:
+            shim = getattr(renderer_api, f"render_{backend}")
+            assert shim.__name__ == f"render_{backend}"
+            assert shim(self.ir, some_random_param=1) == render(backend, self.ir)
+
+    def test_repeat_renders_are_cached_by_ir_snapshot(self):
+        """Identical IR reuses cached output; mutating the IR is a cache miss."""
+        from pcs.renderer_api import _render_cached
+
+        _render_cached.cache_clear()
+        first = render("rust", self.ir, func_name="cached")
+        same_ir = PyToIR().parse("[x**2 for x in range(5)]")
+        again = render("rust", same_ir, func_name="cached")
+        assert first == again
+        assert _render_cached.cache_info().hits == 1
+
+        self.ir.generators[0].filters.append("x > 1")
+        assert ".filter(" in render("rust", self.ir, func_name="cached")
+
+    def test_cache_is_keyed_on_backend(self, monkeypatch):
+        """Rebinding a backend misses the cache; filters added later are seen."""
+        from pcs import renderer_api
+
+        sum_ir = PyToIR().parse("sum(x for x in range(100))")
+        assert "ifelse" not in render("julia", sum_ir, mode="broadcast")
+        sum_ir.generators[0].filters.append("x > 2")
+        assert "sum(ifelse." not in render("julia", sum_ir)
+
+        monkeypatch.setitem(renderer_api._BACKENDS, "julia", lambda ir, **kw: "stub")
+        assert render("julia", sum_ir) == "stub"
+
+    def test_unhashable_provenance_renders_uncached(self):
+        """IR whose snapshot can't be hashed still renders, bypassing the cache."""
+        self.ir.provenance = {"sources": ["a.py", "b.py"]}
+        assert render("rust", self.ir) == render("rust", self.ir)
@@ -0,0 +1,87 @@
+"""
+Unit tests for the Rust iterator/Rayon renderer
+"""
+
+from pcs.core import PyToIR
+from pcs.renderers.rust import render_rust
+
+
+def _render(code: str, **kwargs) -> str:
+    return render_rust(PyToIR().parse(code), **kwargs)
+
+
+def test_plain_sum_becomes_counted_loop():
+    out = _render("sum(x * x for x in range(1, 11))", int_type="i64")
+    assert "#[inline(always)]" in out
+    assert "let mut acc: i64 = 0;" in out
+    assert "for x in 1i64..11i64 {" in out
+    assert "acc += x * x;" in out
+
+
+def test_counted_loop_computes_in_requested_type():
+    # x * x passes i32::MAX well before 100000, so x itself must be i64
+    out = _render("sum(x * x for x in range(1, 100001))", int_type="i64")
+    assert "for x in 1i64..100001i64 {" in out
+    assert " as " not in out
+    assert "wrapping_add" not in out
+
+
+def test_filtered_or_strided_sums_keep_iterator_chain():
+    assert ".sum()" in _render("sum(x for x in range(10) if x > 2)")
+    assert ".step_by(2)" in _render("sum(x for x in range(0, 10, 2))")
+
+
+def test_parallel_sum_uses_large_rayon_chunks():
+    out = _render("sum(x for x in range(1000000))", parallel=True)
+    assert ".into_par_iter().with_min_len(65536).map(|x| x).sum()" in out
+    # A single minimum-length chunk would serialize the whole range
+    out = _render("sum(x for x in range(100000))", parallel=True)
+    assert "(0..100000).into_par_iter().map(|x| x).sum()" in out
+
+
+def test_array_indexing_sum_is_tiled():
+    out = _render("sum(a[x] for x in range(100000))")
+    assert "(0..100000).step_by(4096).map(|base| (base..(base + 4096).min(100000))" in out
+    assert ".map(|x| a[x]).sum::<i32>()).sum()" in out
+
+
+def test_hashed_results_use_presized_fxhash():
+    out = _render("{x: x * x for x in range(0, 10, 2)}")
+    assert out.startswith("use rustc_hash::FxHashMap;\n")
+    assert "-> FxHashMap<i32, i32> {" in out
+    assert "FxHashMap::with_capacity_and_hasher(5, Default::default());" in out
+    assert "result.extend((0..10).step_by(2).map(|x| (x, x * x)));" in out
+
+    out = _render("{x for x in range(100)}", parallel=True)
+    assert "result.par_extend((0..100).into_par_iter().map(|x| x));" in out
+
+
+def test_auto_int_type_is_narrowest_overflow_free_width():
+    assert "-> Vec<i16> {" in _render("[x * x for x in range(100)]", int_type="auto")
+    assert "-> Vec<i32> {" in _render("[x * x for x in range(1000)]", int_type="auto")
+    out = _render("sum(x * x for x in range(100000))", int_type="auto")
+    assert "let mut acc: i64 = 0;" in out
+    assert "-> FxHashMap<i16, i16> {" in _render(
+        "{x: x + 1 for x in range(10)}", int_type="auto"
+    )
+    # Bounds through indexing can't be derived, so stay wide
+    assert "-> i64 {" in _render("max(a[x] for x in range(10))", int_type="auto")
+
+
+def test_auto_int_type_reaches_counted_loop_bounds():
+    out = _render("sum(x * x for x in range(1, 100001))", int_type="auto")
+    assert "let mut acc: i64 = 0;" in out
+    assert "for x in 1i64..100001i64 {" in out
+    # Non-integer powers can't be bounded as integers
+    assert "-> Vec<i64> {" in _render("[x ** 0.5 for x in range(3)]", int_type="auto")
+
+
+def test_rustc_hash_only_for_hashed_results():
+    assert "rustc_hash" not in _render("sum(x for x in range(10))")
+    assert "rustc_hash" not in _render("[x for x in range(10)]", parallel=True)
+
+
+def test_filtered_hashed_results_are_not_presized():
+    out = _render("{x for x in range(1000000000) if x == 5}")
+    assert "with_capacity" not in out
+    assert "(0..1000000000).filter(|&x| x == 5).map(|x| x).collect()" in out